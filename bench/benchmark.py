@@ -0,0 +1,183 @@
+"""End-to-end benchmark of ``main.run_all`` against the synthetic boards.
+
+Every site is run on its own and then all sites together, each against a
+fresh temporary job database, with headless Chrome. Each run is done twice:
+once for wall time, pages served and pages/sec, and once under tracemalloc
+for the peak Python heap and the peak RSS of this process and of its browser
+children (sampled with psutil). Postings scraped are reported next to the
+postings the board lists for the site, so truncated fetches show up:
+
+    python -m bench.benchmark --postings 10000 --page-size 50 --latency 0.05
+
+Run it from the repository root so the site modules can be imported.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import psutil
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+import dedup
+import job_db
+import main
+import search_index
+import snapshots
+from bench.fakeboard import FakeBoard
+from utils import matching
+from utils import notifier
+from utils import output
+
+_Chrome = webdriver.Chrome
+
+
+def _headless_chrome(*args, options=None, **kwargs):
+    options = options or ChromeOptions()
+    for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080"):
+        options.add_argument(argument)
+    return _Chrome(*args, options=options, **kwargs)
+
+
+def _point_at(board, workdir):
+    """Redirect every fetcher and data file at the fake board and ``workdir``."""
+    modules = dict((name, module) for module, name in main.SITES)
+    for name, overrides in board.site_urls().items():
+        for attr, value in overrides.items():
+            setattr(modules[name], attr, value)
+    webdriver.Chrome = _headless_chrome
+    job_db.DB_PATH = os.path.join(workdir, "jobs_db.yaml")
+    job_db.ARCHIVE_PATH = os.path.join(workdir, "jobs_archive.yaml")
+    search_index.INDEX_PATH = os.path.join(workdir, "search_index.json")
+    dedup.INDEX_PATH = os.path.join(workdir, "dedup_index.json")
+    snapshots.SNAPSHOT_DIR = os.path.join(workdir, "snapshots")
+    matching.CACHE_PATH = os.path.join(workdir, "match_cache.json")
+    notifier.CONFIG_PATH = os.path.join(workdir, "notify.json")
+    output.OUTPUT_DIR = os.path.join(workdir, "output")
+    with open(notifier.CONFIG_PATH, "w", encoding="utf-8") as f:
+        json.dump({"sinks": [{"type": "file", "path": os.path.join(workdir, "notifications.log")}]}, f)
+    os.chdir(workdir)
+
+
+def _reset(workdir):
+    for name in ("jobs_db.yaml", "jobs_archive.yaml", "search_index.json", "dedup_index.json",
+                 "match_cache.json"):
+        path = os.path.join(workdir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(snapshots.SNAPSHOT_DIR, ignore_errors=True)
+    # Each pass starts cold, without the previous pass's match memo
+    matching._cache = None
+    matching._seen.clear()
+    matching._registered.clear()
+    matching._touched.clear()
+
+
+class _RssSampler:
+    """Peak RSS of this process and of all its children while the block runs."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = self.children_peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._poll()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._poll()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._poll()
+
+    def _poll(self):
+        children = 0
+        for child in self._process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, self._process.memory_info().rss)
+        self.children_peak = max(self.children_peak, children)
+
+
+def measure(board, workdir, sites, label):
+    # Timing pass, without tracing overhead
+    _reset(workdir)
+    board.hits.clear()
+    start = time.perf_counter()
+    main.run_all(sites)
+    elapsed = time.perf_counter() - start
+    pages = sum(board.hits.values())
+    scraped = sum(len(output.read_site_output(name).get("all_titles", [])) for _, name in sites)
+    listed = sum(board.listed(name, getattr(module, "SEARCH_QUERIES", None)) for module, name in sites)
+
+    # Memory pass
+    _reset(workdir)
+    with _RssSampler() as rss:
+        tracemalloc.start()
+        main.run_all(sites)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "run": label,
+        "mode": ",".join(sorted({getattr(module, "FETCH_MODE", "selenium") for module, _ in sites})),
+        "wall_s": round(elapsed, 2),
+        "py_peak_mb": round(peak / 2**20, 1),
+        "rss_mb": round(rss.peak / 2**20, 1),
+        "children_rss_mb": round(rss.children_peak / 2**20, 1),
+        "pages": pages,
+        "pages_per_s": round(pages / elapsed, 1) if elapsed else 0.0,
+        "scraped": scraped,
+        "listed": listed,
+    }
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=10000, help="postings per site")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--sites", nargs="*", help="sites to run (default: all)")
+    parser.add_argument("--skip-combined", action="store_true", help="only run the per-site benchmarks")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    sites = [(module, name) for module, name in main.SITES if not args.sites or name in args.sites]
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir, FakeBoard(args.postings, args.page_size, args.latency) as board:
+        _point_at(board, workdir)
+        for site in sites:
+            results.append(measure(board, workdir, [site], site[1]))
+        if not args.skip_combined and len(sites) > 1:
+            results.append(measure(board, workdir, sites, "run_all"))
+        os.chdir(cwd)
+
+    for row in results:
+        if row["scraped"] < row["listed"]:
+            print(f"warning: {row['run']} scraped {row['scraped']} of {row['listed']} listed postings")
+    columns = list(results[0]) if results else []
+    print(" ".join(f"{c:>16}" for c in columns))
+    for row in results:
+        print(" ".join(f"{str(row[c]):>16}" for c in columns))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,320 @@
+"""Local stand-in for the career sites, serving synthetic boards in each
+site's real markup so the fetchers can be exercised without production traffic.
+
+Run ``python -m bench.fakeboard --postings 10000`` and point the site modules
+at the printed URLs (see ``FakeBoard.site_urls``).
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+LEVELS = ["", "Senior ", "Staff ", "Lead ", "Principal ", "Associate "]
+DOMAINS = [
+    "Embedded Software", "Firmware", "Robotics", "RTOS", "Device Driver", "Cloud Software",
+    "Data", "Mechanical", "Electrical", "Research Software", "Autonomy", "Facilities",
+    "Administrative", "Finance", "Real-Time Systems", "Network",
+]
+ROLES = ["Engineer", "Scientist", "Developer", "Technician", "Analyst", "Manager", "Architect"]
+
+SITES = ["lanl", "osu", "sri", "llmit", "swri", "umich", "vanderbilt_isis"]
+
+
+def make_postings(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    postings = []
+    for i in range(count):
+        title = f"{rng.choice(LEVELS)}{rng.choice(DOMAINS)} {rng.choice(ROLES)}"
+        postings.append({"id": 100000 + i, "title": title, "slug": quote(title.lower().replace(" ", "-"))})
+    return postings
+
+
+def _page(body: str, script: str = "") -> bytes:
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Careers</title></head>"
+        f"<body>{body}<script>{script}</script></body></html>"
+    ).encode("utf-8")
+
+
+class FakeBoard:
+    """Threaded HTTP server hosting one synthetic board per site under ``/<site>/``.
+
+    ``postings`` jobs are generated per site, list pages hold ``page_size``
+    rows, and every request sleeps ``latency`` seconds before answering.
+    Requests served are counted per site in ``hits``.
+    """
+
+    def __init__(self, postings: int = 1000, page_size: int = 25, latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.page_size = page_size
+        self.latency = latency
+        self.boards: Dict[str, List[dict]] = {site: make_postings(postings, seed + n) for n, site in enumerate(SITES)}
+        self.hits: Counter = Counter()
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                board._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def site_urls(self) -> Dict[str, Dict[str, str]]:
+        """Module attribute overrides that point each fetcher at this server."""
+        return {
+            "lanl": {"BASE_URL": f"{self.url}/lanl"},
+            "osu": {"BASE_URL": f"{self.url}/osu/OSUCareers"},
+            "sri": {"SEARCH_URL": f"{self.url}/sri/jobs/search?ss=1"},
+            "llmit": {"BASE_URL": f"{self.url}/llmit"},
+            "swri": {"RESULTS_URL": f"{self.url}/swri/ResApp/Job_Search_Results.aspx?EMPLOYMENT_STATUS=Salaried"},
+            "umich": {"BASE_URL": f"{self.url}/umich"},
+            "vanderbilt_isis": {"SEARCH_URL": f"{self.url}/vanderbilt_isis/jobs"},
+        }
+
+    def listed(self, site: str, queries: Optional[List[str]] = None) -> int:
+        """Postings a complete fetch of ``site`` should see (those matching ``queries`` if given)."""
+        if not queries:
+            return len(self.boards[site])
+        return len({p["id"] for query in queries for p in self._matching(site, query)})
+
+    # -- request handling -------------------------------------------------
+
+    def _handle(self, request) -> None:
+        parsed = urlparse(request.path)
+        parts = parsed.path.strip("/").split("/")
+        site, rest = parts[0], "/".join(parts[1:])
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        renderer = getattr(self, f"_{site}", None)
+        if site not in self.boards or renderer is None:
+            body, status, ctype = b"not found", 404, "text/plain"
+        else:
+            self.hits[site] += 1
+            if self.latency:
+                time.sleep(self.latency)
+            body, status, ctype = renderer(rest, query), 200, "text/html; charset=utf-8"
+            if rest.startswith("api/"):
+                ctype = "application/json"
+        request.send_response(status)
+        request.send_header("Content-Type", ctype)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _slice(self, postings, page):
+        start = (page - 1) * self.page_size
+        return postings[start:start + self.page_size], start + self.page_size < len(postings)
+
+    def _matching(self, site, keyword):
+        keyword = (keyword or "").lower()
+        return [p for p in self.boards[site] if keyword in p["title"].lower()]
+
+    def _lanl(self, path, query):
+        postings = self.boards["lanl"]
+
+        def rows(page):
+            chunk, more = self._slice(postings, page)
+            markup = "".join(
+                f"<tr class='jtable-data-row' data-href='/search/jobdetails/{p['slug']}/{p['id']}'>"
+                f"<td class='title-column'><span>{html.escape(p['title'])}</span></td></tr>"
+                for p in chunk
+            )
+            return markup, more
+
+        if path.startswith("api/rows"):
+            markup, more = rows(int(query.get("page", 1)))
+            return json.dumps({"rows": markup, "more": more}).encode("utf-8")
+        markup, more = rows(1)
+        body = (
+            "<input placeholder='Keyword / Req. Number'>"
+            f"<table class='jtable'><tbody id='rows'>{markup}</tbody></table>"
+            "<span class='jtable-page-number-next ui-button ui-state-default"
+            f"{'' if more else ' ui-state-disabled'}' style='display:inline-block;padding:4px'>Load more jobs</span>"
+        )
+        script = """
+        const host = document.createElement('div');
+        host.id = 'usercentrics-root';
+        document.body.appendChild(host);
+        const root = host.attachShadow({mode: 'open'});
+        root.innerHTML = '<div data-testid="uc-app-container"><div data-testid="uc-ccpa-banner">' +
+            '<button data-testid="uc-ccpa-button">OK</button></div></div>';
+        root.querySelector('button').addEventListener('click', () => host.remove());
+        let page = 1;
+        const next = document.querySelector('.jtable-page-number-next');
+        next.addEventListener('click', async () => {
+            if (next.classList.contains('ui-state-disabled')) return;
+            page += 1;
+            const data = await (await fetch('/lanl/api/rows?page=' + page)).json();
+            document.getElementById('rows').insertAdjacentHTML('beforeend', data.rows);
+            if (!data.more) next.classList.add('ui-state-disabled');
+        });
+        """
+        return _page(body, script)
+
+    def _osu(self, path, query):
+        if not path.endswith("search"):
+            return _page(
+                "<form action='OSUCareers/search' method='get'>"
+                "<input name='q' data-automation-id='keywordSearchInput'></form>"
+            )
+        keyword = query.get("q", "")
+        page = int(query.get("page", 1))
+        chunk, more = self._slice(self._matching("osu", keyword), page)
+        items = "".join(
+            f"<li><a data-automation-id='jobTitle' href='{self.url}/osu/OSUCareers/job/{p['slug']}_{p['id']}'>"
+            f"{html.escape(p['title'])}</a></li>"
+            for p in chunk
+        )
+        next_url = f"search?q={quote(keyword)}&page={page + 1}"
+        return _page(
+            f"<ul role='list'>{items}</ul>"
+            f"<button aria-label='next' class='{'css-next' if more else 'css-next disabled'}' "
+            f"onclick=\"location.href='{next_url}'\">next</button>"
+        )
+
+    def _sri(self, path, query):
+        if query.get("in_iframe") != "1":
+            return _page("<iframe id='icims_content_iframe' src='search?ss=1&in_iframe=1' width='100%' height='800'></iframe>")
+        rows = "".join(
+            f"<div class='row'><div class='col-xs-12 title'>"
+            f"<a href='{self.url}/sri/jobs/{p['id']}/{p['slug']}/job?in_iframe=1'>"
+            f"<span class='sr-only field-label'>Title</span><h3>{html.escape(p['title'])}</h3></a></div></div>"
+            for p in self.boards["sri"]
+        )
+        return _page(f"<div class='container-fluid iCIMS_JobsTable'>{rows}</div>")
+
+    def _llmit(self, path, query):
+        postings = self.boards["llmit"]
+        page = int(query.get("page", 1))
+        chunk, _ = self._slice(postings, page)
+        pages = max(1, -(-len(postings) // self.page_size))
+        rows = "".join(
+            f"<tr class='data-row'><td class='colTitle'><a class='jobTitle-link' "
+            f"href='/job/Lexington-{p['slug']}-MA-02420/{p['id']}00/'>{html.escape(p['title'])}</a></td></tr>"
+            for p in chunk
+        )
+        links = "".join(
+            f"<li><a class='current-page' href='search?page={n}'>{n}</a></li>" if n == page
+            else f"<li><a href='search?page={n}'>{n}</a></li>"
+            for n in range(max(1, page - 2), min(pages, page + 4) + 1)
+        )
+        return _page(
+            f"<table id='searchresults'><tbody>{rows}</tbody></table>"
+            f"<ul class='pagination'>{links}</ul>"
+        )
+
+    def _swri(self, path, query):
+        if path.endswith("Job_Search.aspx"):
+            return _page(
+                "<form action='Job_Search_Results.aspx' method='get'>"
+                "<input type='hidden' name='EMPLOYMENT_STATUS' value='Salaried'>"
+                "<input type='submit' id='btnSearch' value='Search'></form>"
+            )
+        rows = "".join(
+            f"<tr><td>{p['id']}</td><td><a href='{self.url}/swri/ResApp/Job_Details.aspx?JOB_CD={p['id']}"
+            f"&JOB_TITLE={quote(p['title'])}'>{html.escape(p['title'])}</a></td></tr>"
+            for p in self.boards["swri"]
+        )
+        return _page(f"<table id='tblHistory'><tr><th>Code</th><th>Title</th></tr>{rows}</table>")
+
+    def _umich(self, path, query):
+        if "search" not in query:
+            return _page(
+                "<form action='search-jobs' method='get'><input type='hidden' name='search' value='1'>"
+                "<input type='submit' id='edit-submit-job-search' value='Search'></form>"
+            )
+        page = int(query.get("page", 1))
+        chunk, more = self._slice(self.boards["umich"], page)
+        rows = "".join(
+            f"<tr><td class='views-field-title'><a href='/job_detail/{p['id']}/{p['slug']}'>"
+            f"{html.escape(p['title'])}</a></td></tr>"
+            for p in chunk
+        )
+        pager = f"<li><a rel='next' href='search-jobs?search=1&page={page + 1}'>Next</a></li>" if more else ""
+        return _page(
+            f"<div id='block-system-main-block'><table class='cols-5'><tbody>{rows}</tbody></table></div>"
+            f"<nav role='navigation'><ul class='js-pager__items'>{pager}</ul></nav>"
+        )
+
+    def _vanderbilt_isis(self, path, query):
+        def items(keyword, page):
+            chunk, more = self._slice(self._matching("vanderbilt_isis", keyword), page)
+            markup = "".join(
+                f"<li data-qa='searchResultItem' style='height:60px'>"
+                f"<a class='job-list-item__link' href='{self.url}/vanderbilt_isis/job/{p['id']}'>"
+                f"<span class='job-tile__title'>{html.escape(p['title'])}</span></a></li>"
+                for p in chunk
+            )
+            return markup, more
+
+        if path.startswith("api/items"):
+            markup, more = items(query.get("keyword"), int(query.get("page", 1)))
+            return json.dumps({"items": markup, "more": more}).encode("utf-8")
+        if "keyword" not in query:
+            return _page(
+                "<input data-qa='searchKeywordsInput'>"
+                "<button data-qa='searchStartBtn' onclick=\"location.href='jobs?keyword=' + "
+                "encodeURIComponent(document.querySelector('input').value)\">Search</button>"
+            )
+        markup, more = items(query["keyword"], 1)
+        script = f"""
+        let page = 1, more = {json.dumps(more)}, loading = false;
+        window.addEventListener('scroll', async () => {{
+            if (!more || loading || window.innerHeight + window.scrollY < document.body.scrollHeight - 100) return;
+            loading = true;
+            page += 1;
+            const data = await (await fetch('/vanderbilt_isis/api/items?keyword={quote(query["keyword"])}&page=' + page)).json();
+            document.querySelector('ul.jobs-list__list').insertAdjacentHTML('beforeend', data.items);
+            more = data.more;
+            loading = false;
+        }});
+        """
+        return _page(f"<ul class='jobs-list__list'>{markup}</ul>", script)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic job boards for every site.")
+    parser.add_argument("--postings", type=int, default=1000, help="postings per site")
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    board = FakeBoard(args.postings, args.page_size, args.latency, port=args.port)
+    print(f"Serving synthetic boards on {board.url}")
+    for site, overrides in board.site_urls().items():
+        print(f"  {site}: {overrides}")
+    try:
+        board._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from utils import output
+
+INDEX_PATH = os.path.join(os.path.dirname(__file__), "dedup_index.json")
+NUM_PERM = 64
+BANDS = 21  # 3 rows per band, candidates above roughly 0.35 similarity
+THRESHOLD = 0.7  # estimated Jaccard of the shingle sets
+# Only postings seen within this many days can be reposted
+REPOST_DAYS = 30
+# Bump when shingling changes so cached signatures are recomputed
+VERSION = 3
+
+_MERSENNE = (1 << 61) - 1
+_PERMS = [
+    tuple(v % _MERSENNE for v in struct.unpack(
+        "<QQ", hashlib.blake2b(f"h1b-minhash-{i}".encode(), digest_size=16).digest()))
+    for i in range(NUM_PERM)
+]
+_REQ_NUMBER = re.compile(r"[\w-]*\d{4,}[\w-]*")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# Seniority words: titles that differ in these are different openings
+_LEVELS = {
+    "1": "1", "i": "1", "2": "2", "ii": "2", "3": "3", "iii": "3", "4": "4", "iv": "4", "5": "5", "v": "5",
+    "jr": "junior", "junior": "junior", "sr": "senior", "senior": "senior", "lead": "lead",
+    "principal": "principal", "chief": "chief", "associate": "associate", "intermediate": "intermediate",
+    "entry": "entry", "intern": "intern", "postdoc": "postdoc",
+}
+# Specialty words: "Embedded Software Engineer" is not a repost of "Software Engineer"
+_DOMAINS = {
+    "embedded", "firmware", "software", "hardware", "system", "systems", "cloud", "research", "robotics",
+    "autonomy", "automotive", "web", "mobile", "data", "database", "security", "cybersecurity", "network",
+    "quality", "test", "devops", "frontend", "backend", "stack", "fpga", "rf", "electronics", "electrical",
+    "mechanical", "spacecraft", "ai", "ml", "machine", "learning", "vision", "controls", "it", "computer",
+    "operations", "infrastructure", "application", "applications", "simulation", "graphics", "game",
+}
+# Words that vary between listings of the same opening ("Tech Staff", "- MA")
+_FILLER = {"tech", "technical", "staff", "member", "of", "the", "and", "a", "for", "position", "opening", "ma"}
+
+
+def normalize(text: str) -> str:
+    """Lower-case, drop requisition numbers and punctuation, collapse spaces."""
+    text = _REQ_NUMBER.sub(" ", text.lower())
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Words and word pairs of the normalized text, without filler words."""
+    words = [word for word in normalize(text).split() if word not in _FILLER]
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def levels(title: str) -> FrozenSet[str]:
+    """Seniority markers in ``title``, e.g. ``{"senior", "2"}``."""
+    return frozenset(_LEVELS[word] for word in normalize(title).split() if word in _LEVELS)
+
+
+def domains(title: str) -> FrozenSet[str]:
+    """Specialty words in ``title``, e.g. ``{"embedded", "software"}``."""
+    return frozenset(word for word in normalize(title).split() if word in _DOMAINS)
+
+
+def signature(text: str) -> Tuple[int, ...]:
+    """MinHash signature over the shingles of ``text``."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles(text) or {""}
+    ]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) & 0xFFFFFFFF for a, b in _PERMS)
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _job_text(job: dict) -> str:
+    return f"{job.get('title', '')} {job.get('description', '')}".strip()
+
+
+def _text_key(text: str) -> str:
+    return hashlib.blake2b(normalize(text).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SimilarityIndex:
+    """LSH index mapping postings to clusters of near-identical openings.
+
+    Two postings match when their shingle sets are similar both ways
+    (``THRESHOLD``) and their titles carry the same seniority markers and
+    specialty words, so "Engineer II" and "Engineer III", or "Software
+    Engineer" and "Embedded Software Engineer", stay apart. Filler such as
+    "(Tech Staff)" is ignored.
+
+    Titles alone are too generic to match across employers, so postings from
+    different sites are only clustered together when both carry a description.
+    On the same site, a posting still listed in the current run is a separate
+    opening, not a repost. With ``now``, only postings seen (or closed) within
+    ``REPOST_DAYS`` can be matched.
+
+    Signatures are cached by normalized text in ``dedup_index.json`` so
+    building the index does not rehash the whole history every run.
+    """
+
+    def __init__(self, signatures: Optional[Dict[str, str]] = None):
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._entries: List[Tuple[Tuple[int, ...], tuple, str, str, dict]] = []
+        self._cached = signatures or {}
+        self._signatures: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bands(self, sig):
+        rows = NUM_PERM // BANDS
+        return [(band, sig[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+
+    def _signature(self, job: dict) -> Tuple[int, ...]:
+        """Signature of ``job``, from the cache when possible."""
+        text = _job_text(job)
+        key = _text_key(text)
+        packed = self._signatures.get(key) or self._cached.get(key)
+        if packed is None:
+            packed = base64.b64encode(struct.pack(f"<{NUM_PERM}I", *signature(text))).decode("ascii")
+        self._signatures[key] = packed
+        return struct.unpack(f"<{NUM_PERM}I", base64.b64decode(packed))
+
+    def find(self, site: str, job: dict, sig=None, now: Optional[str] = None) -> Optional[str]:
+        """Return the cluster ID of the closest known posting, if any.
+
+        With ``now``, same-site postings whose ``last_seen`` is ``now`` are
+        skipped since they are listed alongside ``job``, and so are postings
+        last seen or closed more than ``REPOST_DAYS`` before ``now``.
+        """
+        sig = sig or self._signature(job)
+        title = job.get("title", "")
+        kind = (levels(title), domains(title))
+        has_description = bool(job.get("description"))
+        cutoff = None
+        if now:
+            cutoff = (datetime.fromisoformat(now) - timedelta(days=REPOST_DAYS)).isoformat(timespec="seconds")
+        best, best_score = None, THRESHOLD
+        seen = set()
+        for key in self._bands(sig):
+            for idx in self._buckets.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                other_sig, other_kind, other_site, cluster, other = self._entries[idx]
+                if other_kind != kind:
+                    continue
+                if other_site != site and not (has_description and other.get("description")):
+                    continue
+                if other_site == site and now and other.get("last_seen") == now:
+                    continue
+                if cutoff and (other.get("removed") or other.get("last_seen") or "") < cutoff:
+                    continue
+                score = similarity(sig, other_sig)
+                if score >= best_score:
+                    best, best_score = cluster, score
+        return best
+
+    def add(self, site: str, job: dict, cluster: str, sig=None) -> None:
+        sig = sig or self._signature(job)
+        title = job.get("title", "")
+        idx = len(self._entries)
+        self._entries.append((sig, (levels(title), domains(title)), site, cluster, job))
+        for key in self._bands(sig):
+            self._buckets.setdefault(key, []).append(idx)
+
+    def assign(self, site: str, job: dict, now: Optional[str] = None) -> Tuple[str, bool]:
+        """Index a posting and return ``(cluster_id, is_new_cluster)``."""
+        sig = self._signature(job)
+        cluster = self.find(site, job, sig, now)
+        is_new = cluster is None
+        if is_new:
+            cluster = "c-" + hashlib.blake2b(job.get("url", "").encode("utf-8"), digest_size=5).hexdigest()
+        self.add(site, job, cluster, sig)
+        return cluster, is_new
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Persist the signatures of the indexed postings."""
+        with output.atomic_write(path or INDEX_PATH) as f:
+            json.dump({"version": VERSION, "signatures": self._signatures}, f, separators=(",", ":"))
+
+
+def build_index(*dbs: Dict[str, List[dict]], path: Optional[str] = None) -> SimilarityIndex:
+    """Index every job in ``dbs``, assigning clusters to jobs stored without one."""
+    path = path or INDEX_PATH
+    signatures = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == VERSION:
+            signatures = data["signatures"]
+    index = SimilarityIndex(signatures)
+    for db in dbs:
+        for site, jobs in db.items():
+            for job in jobs:
+                if job.get("cluster"):
+                    index.add(site, job, job["cluster"])
+                else:
+                    job["cluster"], _ = index.assign(site, job)
+    return index
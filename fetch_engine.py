@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import logging
+import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_local = threading.local()
+
+
+def browser_allowance() -> Optional[int]:
+    """Browsers the fetcher running on this thread may open (None outside ``run_blocking``)."""
+    return getattr(_local, "browsers", None)
+
+
+def _with_allowance(browsers: int, fn: Callable, args: tuple):
+    _local.browsers = browsers
+    try:
+        return fn(*args)
+    finally:
+        _local.browsers = None
+
+
+class _Slots:
+    """Counting semaphore that hands out several slots at once.
+
+    Taking all of a site's slots in one step means two sites that each need
+    more than one browser can never hold part of the pool and wait on each other.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self._free = total
+        self._changed = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def take(self, count: int):
+        count = max(1, min(count, self.total))
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._free >= count)
+            self._free -= count
+        try:
+            yield count
+        finally:
+            async with self._changed:
+                self._free += count
+                self._changed.notify_all()
+
+
+class FetchEngine:
+    """Shared asyncio fetch machinery for all sites of a run.
+
+    Browserless fetchers get ``get``/``text`` on one keep-alive connection
+    pool (HTTP/2 where the server offers it) with a per-host connection limit
+    and retries with jittered exponential backoff. Selenium fetchers are run
+    with ``run_blocking`` on a small thread pool and take one of ``browsers``
+    slots per browser they open, so fan-out searches count against the same
+    limit. HTTP requests and browser runs draw from the same global
+    ``concurrency`` budget.
+    """
+
+    def __init__(self, concurrency: int = 8, per_host: int = 4, browsers: int = 2,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 30.0):
+        self.retries = retries
+        self.backoff = backoff
+        self._budget = asyncio.Semaphore(concurrency)
+        self._per_host = per_host
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(self._per_host))
+        self._browsers = _Slots(browsers)
+        self._executor = ThreadPoolExecutor(max_workers=browsers, thread_name_prefix="browser")
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+        self._executor.shutdown(wait=True)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET ``url``, retrying connection errors and 429/5xx responses."""
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            # Wait for the host before taking from the shared budget, so requests
+            # queued behind a busy host do not starve the others
+            async with self._hosts[host], self._budget:
+                try:
+                    response = await self._client.get(url, **kwargs)
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return response
+                    error = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get("Retry-After", "")
+                except httpx.TransportError as e:
+                    error, retry_after = repr(e), ""
+            if attempt == self.retries:
+                raise RuntimeError(f"GET {url} failed after {attempt + 1} attempts: {error}")
+            # Full jitter keeps sites sharing a host from retrying in lockstep
+            delay = random.uniform(0, self.backoff * 2 ** attempt)
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            logger.warning(f"GET {url} failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def text(self, url: str, **kwargs) -> str:
+        return (await self.get(url, **kwargs)).text
+
+    async def run_blocking(self, fn: Callable, *args, browsers: int = 1):
+        """Run a blocking (Selenium) fetcher that opens up to ``browsers`` browsers.
+
+        The fetcher gets as many slots as are available, up to ``browsers``
+        and the pool size, and sees the number granted through
+        ``browser_allowance()``.
+        """
+        # Wait for free browsers before taking from the shared budget
+        async with self._browsers.take(browsers) as granted, self._budget:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, _with_allowance, granted, fn, args
+            )
+
+
+def run(fetch: Callable[[FetchEngine], Awaitable], engine_options: Optional[dict] = None):
+    """Run an async fetcher to completion on its own engine (for standalone use)."""
+    async def _main():
+        async with FetchEngine(**(engine_options or {})) as engine:
+            return await fetch(engine)
+
+    return asyncio.run(_main())
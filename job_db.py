@@ -1,28 +1,135 @@
+import logging
 import os
-import yaml
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import dedup
+import search_index
+from utils import output
+
+logger = logging.getLogger(__name__)
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "jobs_db.yaml")
+# Closed postings are moved here so the active database stays small
+ARCHIVE_PATH = os.path.join(os.path.dirname(__file__), "jobs_archive.yaml")
+# Runs in a row a job must be missing before it is closed, so one partial
+# fetch does not archive postings that are still listed
+MISSED_RUNS = 3
 
 
-def load_db() -> Dict[str, List[dict]]:
+def load_db(path: Optional[str] = None) -> Dict[str, List[dict]]:
     """Load the database from disk."""
-    if os.path.exists(DB_PATH):
-        with open(DB_PATH, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+    path = path or DB_PATH
+    if os.path.exists(path):
+        return output.load_yaml(path) or {}
     return {}
 
 
-def save_db(db: Dict[str, List[dict]]) -> None:
-    """Persist the database to disk."""
-    with open(DB_PATH, "w", encoding="utf-8") as f:
-        yaml.dump(db, f, allow_unicode=True)
+def save_db(db: Dict[str, List[dict]], path: Optional[str] = None) -> None:
+    """Persist the database to disk atomically."""
+    path = path or DB_PATH
+    output.dump_yaml(db, path)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
 
+def add_jobs(
+    site: str,
+    jobs: List[dict],
+    db: Dict[str, List[dict]],
+    index: Optional[dedup.SimilarityIndex] = None,
+    now: Optional[str] = None,
+    search: Optional[search_index.SearchIndex] = None,
+    archive: Optional[Dict[str, List[dict]]] = None,
+) -> List[dict]:
+    """Add jobs for a site to the database and return the newly added ones.
 
-def add_jobs(site: str, jobs: List[dict], db: Dict[str, List[dict]]) -> List[dict]:
-    """Add jobs for a site to the database and return the newly added ones."""
-    existing = {job["url"] for job in db.get(site, []) if "url" in job}
-    new_jobs = [job for job in jobs if job.get("url") not in existing]
+    Every job seen in this run gets its ``last_seen`` stamped with ``now``;
+    new jobs also get ``first_seen``. A ``search`` index, if given, is
+    updated with every job seen. URLs found in ``archive`` are reopened: the
+    archived record, with its original ``first_seen``, moves back to the
+    database and is not reported as new.
+
+    When a similarity ``index`` is given every new URL is assigned a cluster
+    ID, and reposts or near-duplicates of a known opening are stored but not
+    returned, so callers only report each real opening once.
+    """
+    now = now or _now()
+    existing = {job["url"]: job for job in db.get(site, []) if "url" in job}
+    archived = None
+    new_jobs, reopened = [], []
+    for job in jobs:
+        stored = existing.get(job.get("url"))
+        if stored is None and archive and archive.get(site):
+            if archived is None:
+                archived = {job["url"]: job for job in archive[site] if "url" in job}
+            stored = archived.pop(job.get("url"), None)
+            if stored is not None:
+                stored.pop("removed", None)
+                reopened.append(stored)
+                existing[job.get("url")] = stored
+                logger.info(f"{site}: reopened {stored.get('title')} (first seen {stored.get('first_seen')})")
+        if stored is None:
+            job["first_seen"] = now
+            new_jobs.append(job)
+            stored = existing[job.get("url")] = job
+        stored.setdefault("first_seen", now)
+        stored["last_seen"] = now
+        stored.pop("missed", None)
+        if search is not None:
+            search.add(site, stored)
+    if reopened:
+        moved = {id(job) for job in reopened}
+        archive[site] = [job for job in archive[site] if id(job) not in moved]
+        db.setdefault(site, []).extend(reopened)
     if new_jobs:
         db.setdefault(site, []).extend(new_jobs)
-    return new_jobs
+    if index is None:
+        return new_jobs
+
+    openings = []
+    for job in new_jobs:
+        job["cluster"], is_new = index.assign(site, job, now)
+        if is_new:
+            openings.append(job)
+        else:
+            logger.info(f"{site}: repost of {job['cluster']} -> {job.get('title')}")
+    return openings
+
+
+def close_missing(
+    site: str,
+    jobs: List[dict],
+    db: Dict[str, List[dict]],
+    archive: Dict[str, List[dict]],
+    now: Optional[str] = None,
+    search: Optional[search_index.SearchIndex] = None,
+) -> List[dict]:
+    """Move the site's active jobs absent from ``jobs`` into ``archive``.
+
+    Only the active set of ``site`` is compared against the URLs of this run.
+    Each absent job counts a ``missed`` run, and is closed once it has been
+    missing for ``MISSED_RUNS`` runs in a row: it is tombstoned with a
+    ``removed`` timestamp, moved to the archive and returned. An empty
+    ``jobs`` list usually means the fetch failed, so it counts nothing.
+    """
+    if not jobs:
+        return []
+    now = now or _now()
+    seen = {job.get("url") for job in jobs}
+    active, removed = [], []
+    for job in db.get(site, []):
+        if job.get("url") not in seen:
+            job["missed"] = job.get("missed", 0) + 1
+        (removed if job.get("missed", 0) >= MISSED_RUNS else active).append(job)
+    if removed:
+        for job in removed:
+            del job["missed"]
+            job["removed"] = now
+            if search is not None:
+                search.add(site, job)
+        db[site] = active
+        archive.setdefault(site, []).extend(removed)
+    return removed
@@ -5,20 +5,106 @@ from sites import sri
 from sites import llmit
 from sites import vanderbilt_isis
 from sites import osu
+from utils import matching
+from utils import notifier
+from utils import output
+from utils import profiling
 
+import argparse
+import asyncio
 import os
 import shutil
 import logging
+import uuid
+from datetime import datetime
+
+import dedup
+import fetch_engine
 import job_db
+import scoring
+import search_index
+import snapshots
+import taskqueue
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
-def run_all():
+SITES = [
+    (lanl, "lanl"),
+    (osu, "osu"),
+    (sri, "sri"),
+    (llmit, "llmit"),
+    (swri, "swri"),
+    (umich, "umich"),
+    (vanderbilt_isis, "vanderbilt_isis"),
+]
+# Chrome instances open at once across all Selenium sites, including the
+# extra browsers of fan-out sites (their module-level BROWSERS)
+BROWSERS = 2
+
+
+async def _fetch_local(sites, merge, profile=False):
+    """Fetch all sites on one event loop, merging each as soon as it finishes.
+
+    Browserless sites (those with ``fetch_jobs_async``) share the engine's
+    connection pool; Selenium sites run on its browser threads. When
+    profiling, sites run one at a time on the loop thread so each report
+    only covers its own site.
+    """
+    async with fetch_engine.FetchEngine(browsers=BROWSERS) as engine:
+        async def fetch(module):
+            if hasattr(module, "fetch_jobs_async"):
+                return await module.fetch_jobs_async(engine)
+            if profile:
+                return module.fetch_jobs()
+            return await engine.run_blocking(module.fetch_jobs, browsers=getattr(module, "BROWSERS", 1))
+
+        async def fetch_site(module, name):
+            try:
+                if profile:
+                    with profiling.profile_site(name):
+                        return name, await fetch(module)
+                return name, await fetch(module)
+            except Exception as e:
+                logging.error(f"{name}: fetch failed - {e}")
+                # Keep the match cache entries of the site's last good run
+                matching.forget(name)
+                return name, []
+
+        if profile:
+            for module, name in sites:
+                merge(*await fetch_site(module, name))
+        else:
+            for done in asyncio.as_completed([fetch_site(module, name) for module, name in sites]):
+                merge(*await done)
+
+
+def _fetch_distributed(sites, queue_path, timeout):
+    """Queue one task per site and yield results as workers finish them."""
+    queue = taskqueue.open_queue(queue_path)
+    run_id = uuid.uuid4().hex
+    for _, name in sites:
+        # Workers write the same output files the coordinator was asked for
+        queue.enqueue(run_id, name, {"jsonl": output.JSONL})
+    logging.info(f"Queued {len(sites)} site tasks for run {run_id} in {queue_path}")
+    try:
+        yield from queue.results(run_id, timeout)
+    finally:
+        queue.close()
+
+
+def run_all(sites=None, queue_path=None, timeout=3600, profile=False):
+    """Fetch every site and merge the jobs into the database.
+
+    With ``queue_path`` the sites are fetched by ``worker.py`` processes
+    sharing that queue instead of in this process. ``profile`` writes
+    per-site profiling reports to ``output/profile`` (local fetches only).
+    """
+    sites = sites or SITES
     # Ensure the output directory is deleted at the start of each run
-    output_dir = os.path.join(os.path.dirname(__file__), "output")
+    output_dir = output.OUTPUT_DIR
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)  # Remove the directory and its contents
 
@@ -26,29 +112,66 @@ def run_all():
     os.makedirs(output_dir, exist_ok=True)
 
     db = job_db.load_db()
-
-    sites = [
-        (lanl, "lanl"),
-        (osu, "osu"),
-        (sri, "sri"),
-        (llmit, "llmit"),
-        (swri, "swri"),
-        (umich, "umich"),
-        (vanderbilt_isis, "vanderbilt_isis"),
-
-    ]
+    archive = job_db.load_db(job_db.ARCHIVE_PATH)
+    index = dedup.build_index(db, archive)
+    now = datetime.now().isoformat(timespec="seconds")
+    search = search_index.load()
+    if not search.docs:
+        search = search_index.build(db, archive)
+    search.start_run(now)
+    notifications = notifier.Dispatcher.from_config()
+    # IDF is fitted once per run on every title seen so far
+    weights, min_score = scoring.load_profile()
+    history = [job["title"] for jobs in (*db.values(), *archive.values()) for job in jobs]
+    history.extend(title for _, name in sites for title in snapshots.latest_titles(name))
+    scorer = scoring.Scorer(weights, history)
 
     all_jobs = []
-    for module, name in sites:
-        jobs = module.fetch_jobs()
-        new_jobs = job_db.add_jobs(name, jobs, db)
+
+    def merge(name, jobs, titles=None):
+        if titles is None:
+            titles = output.read_site_output(name).get("all_titles", [])
+        snapshots.record(name, titles, now)
+        # Score the site's jobs as one batch; new jobs then come out best first
+        jobs = scorer.rank(jobs)
+        new_jobs = job_db.add_jobs(name, jobs, db, index, now, search, archive)
         if new_jobs:
             logging.info(f"New jobs for {name}:")
             for job in new_jobs:
-                logging.info(f"  {job['title']} | {job['url']}")
-        all_jobs.extend(jobs)
+                logging.info(f"  {job['score']:+.2f} {job['title']} | {job['url']}")
+            relevant = [job for job in new_jobs if job["score"] > min_score]
+            if relevant:
+                notifications.submit(name, relevant)
+        removed = job_db.close_missing(name, jobs, db, archive, now, search)
+        if removed:
+            logging.info(f"Jobs no longer listed for {name}:")
+            for job in removed:
+                logging.info(f"  {job['title']} | first seen {job.get('first_seen')}")
+        all_jobs.extend(dict(job, site=name) for job in jobs)
+
+    if queue_path:
+        for name, jobs, titles in _fetch_distributed(sites, queue_path, timeout):
+            merge(name, jobs, titles)
+    else:
+        asyncio.run(_fetch_local(sites, merge, profile))
+
+    all_jobs.sort(key=lambda job: job["score"], reverse=True)
+    output.dump_yaml(all_jobs, os.path.join(output_dir, "ranked_jobs.yaml"))
 
     job_db.save_db(db)
+    job_db.save_db(archive, job_db.ARCHIVE_PATH)
+    index.save()
+    search.save()
+    matching.save()
+    notifications.close()
+
 
 if __name__ == "__main__":
-    run_all()
+    parser = argparse.ArgumentParser(description="Fetch jobs from all supported sites.")
+    parser.add_argument("--queue", help="coordinate workers through this queue (SQLite path or redis:// URL)")
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds to wait for workers")
+    parser.add_argument("--profile", action="store_true", help="profile each site into output/profile")
+    parser.add_argument("--jsonl", action="store_true", help="also write gzipped JSON Lines output per site")
+    args = parser.parse_args()
+    output.JSONL = args.jsonl
+    run_all(queue_path=args.queue, timeout=args.timeout, profile=args.profile)
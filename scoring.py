@@ -0,0 +1,97 @@
+import json
+import math
+import os
+import re
+from array import array
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import matching
+
+PROFILE_PATH = os.path.join(os.path.dirname(__file__), "config", "profile.json")
+# Description terms count for less than title terms
+DESCRIPTION_WEIGHT = 0.3
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def terms(text: str) -> List[str]:
+    """Unigrams and bigrams of the folded text, e.g. ``real``, ``time``, ``real time``."""
+    words = _TOKEN.findall(matching.match_key(text))
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def load_profile(path: Optional[str] = None) -> Tuple[Dict[str, float], float]:
+    """Return the ``{term: weight}`` profile and the minimum score to notify."""
+    with open(path or PROFILE_PATH, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    weights = {" ".join(_TOKEN.findall(matching.match_key(t))): w for t, w in config["weights"].items()}
+    return weights, config.get("min_score", 0.0)
+
+
+class Scorer:
+    """Ranks postings by TF-IDF similarity to a weighted keyword profile.
+
+    IDF statistics are fitted once from the title history. A batch of
+    postings is turned into a CSR matrix held in flat ``array`` buffers
+    (``indptr``/``indices``/``data``) and every row is scored with one
+    dot product against the dense profile vector, so negative weights
+    (``co op``, ``intern``) pull false positives below real matches.
+    """
+
+    def __init__(self, weights: Dict[str, float], history: Iterable[str]):
+        self.vocab: Dict[str, int] = {}
+        df = array("l")
+        docs = 0
+        for text in history:
+            docs += 1
+            for term in set(terms(text)):
+                idx = self.vocab.setdefault(term, len(self.vocab))
+                if idx == len(df):
+                    df.append(0)
+                df[idx] += 1
+        self._docs = docs
+        self.idf = array("d", (math.log((1 + docs) / (1 + n)) + 1 for n in df))
+        self.weights = weights
+        self.profile = array("d", bytes(8 * len(self.vocab)))
+        for term, weight in weights.items():
+            self.profile[self._index(term)] = weight
+
+    def _index(self, term: str) -> int:
+        """Vocabulary index of ``term``, adding unseen terms with maximal IDF."""
+        idx = self.vocab.get(term)
+        if idx is None:
+            idx = self.vocab[term] = len(self.vocab)
+            self.idf.append(math.log(1 + self._docs) + 1)
+            self.profile.append(self.weights.get(term, 0.0))
+        return idx
+
+    def transform(self, jobs: List[dict]) -> Tuple[array, array, array]:
+        """L2-normalized TF-IDF rows of ``jobs`` as CSR ``(indptr, indices, data)``."""
+        indptr, indices, data = array("l", [0]), array("l"), array("d")
+        for job in jobs:
+            counts: Dict[int, float] = {}
+            for term in terms(job.get("title", "")):
+                idx = self._index(term)
+                counts[idx] = counts.get(idx, 0.0) + 1.0
+            for term in terms(job.get("description", "")):
+                idx = self._index(term)
+                counts[idx] = counts.get(idx, 0.0) + DESCRIPTION_WEIGHT
+            row = array("d", (tf * self.idf[idx] for idx, tf in counts.items()))
+            norm = math.sqrt(sum(map(mul, row, row))) or 1.0
+            indices.extend(counts)
+            data.extend(value / norm for value in row)
+            indptr.append(len(indices))
+        return indptr, indices, data
+
+    def score(self, jobs: List[dict]) -> array:
+        """Scores of ``jobs`` in input order."""
+        indptr, indices, data = self.transform(jobs)
+        weighted = array("d", map(mul, data, map(self.profile.__getitem__, indices)))
+        return array("d", (sum(weighted[indptr[i]:indptr[i + 1]]) for i in range(len(jobs))))
+
+    def rank(self, jobs: List[dict]) -> List[dict]:
+        """Set ``job["score"]`` on every job and return them best first."""
+        for job, value in zip(jobs, self.score(jobs)):
+            job["score"] = round(value, 4)
+        return sorted(jobs, key=lambda job: job["score"], reverse=True)
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import re
+import shlex
+import time
+from typing import Dict, List, Optional
+
+from utils import output
+
+INDEX_PATH = os.path.join(os.path.dirname(__file__), "search_index.json")
+# Job fields that are tokenized besides the title when a fetcher provides them
+TEXT_FIELDS = ("title", "description", "department", "location")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index over job titles and enriched fields.
+
+    Documents are keyed by URL and updated in place, so feeding the same job
+    again only refreshes its dates. Postings lists hold document IDs in
+    insertion order, which keeps them sorted for cheap intersections. They
+    are saved with the documents, so loading does not re-tokenize them.
+    """
+
+    def __init__(self, docs=None, runs=None, postings=None):
+        self.docs: List[dict] = docs or []
+        self.runs: List[str] = runs or []
+        self._by_url: Dict[str, int] = {doc["url"]: doc_id for doc_id, doc in enumerate(self.docs)}
+        self._postings: Dict[str, List[int]] = postings or {}
+        if postings is None:
+            for doc_id, doc in enumerate(self.docs):
+                self._post(doc_id, doc)
+
+    def _post(self, doc_id: int, doc: dict) -> None:
+        for token in set(tokenize(" ".join(str(doc.get(f, "")) for f in TEXT_FIELDS))):
+            self._postings.setdefault(token, []).append(doc_id)
+
+    def add(self, site: str, job: dict) -> None:
+        """Insert a job, or refresh the dates of one already indexed."""
+        url = job.get("url")
+        if not url:
+            return
+        doc_id = self._by_url.get(url)
+        if doc_id is not None:
+            doc = self.docs[doc_id]
+            for key in ("last_seen", "removed"):
+                if key in job:
+                    doc[key] = job[key]
+                else:
+                    doc.pop(key, None)
+            return
+        doc = {"site": site, "url": url}
+        doc.update({k: job[k] for k in TEXT_FIELDS + ("first_seen", "last_seen", "removed") if k in job})
+        doc_id = self._by_url[url] = len(self.docs)
+        self.docs.append(doc)
+        self._post(doc_id, doc)
+
+    def start_run(self, now: str) -> None:
+        self.runs.append(now)
+
+    def search(
+        self,
+        query: str = "",
+        site: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        new: bool = False,
+        include_closed: bool = False,
+    ) -> List[dict]:
+        """Return docs matching every term and quoted phrase in ``query``.
+
+        ``since``/``until`` compare against ``first_seen`` as ISO strings, so a
+        bare date such as ``2025-06-01`` works. ``new`` keeps only the jobs
+        first seen in the latest run.
+        """
+        phrases = [tokenize(part) for part in _split(query)] if query else []
+        terms = sorted({t for phrase in phrases for t in phrase},
+                       key=lambda t: len(self._postings.get(t, ())))
+        if terms:
+            candidates = set(self._postings.get(terms[0], ()))
+            for term in terms[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(self._postings.get(term, ()))
+            doc_ids = sorted(candidates)
+        else:
+            doc_ids = range(len(self.docs))
+
+        if new and self.runs:
+            since = max(since or "", self.runs[-1])
+        results = []
+        for doc_id in doc_ids:
+            doc = self.docs[doc_id]
+            if site and doc["site"] != site:
+                continue
+            if not include_closed and "removed" in doc:
+                continue
+            first_seen = doc.get("first_seen", "")
+            if since and first_seen < since:
+                continue
+            if until and (not first_seen or first_seen[:len(until)] > until):
+                continue
+            if any(len(p) > 1 and not _contains(doc, p) for p in phrases):
+                continue
+            results.append(doc)
+        return results
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or INDEX_PATH
+        with output.atomic_write(path) as f:
+            json.dump({"docs": self.docs, "runs": self.runs[-50:], "postings": self._postings},
+                      f, ensure_ascii=False, separators=(",", ":"))
+
+
+def _split(query: str) -> List[str]:
+    """Terms and quoted phrases of ``query``; unbalanced quotes (``engineer's``) are plain text."""
+    try:
+        return shlex.split(query)
+    except ValueError:
+        return query.split()
+
+
+def _contains(doc: dict, phrase: List[str]) -> bool:
+    n = len(phrase)
+    for field in TEXT_FIELDS:
+        tokens = tokenize(str(doc.get(field, "")))
+        if any(tokens[i:i + n] == phrase for i in range(len(tokens) - n + 1)):
+            return True
+    return False
+
+
+def load(path: Optional[str] = None) -> SearchIndex:
+    path = path or INDEX_PATH
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return SearchIndex(data.get("docs"), data.get("runs"), data.get("postings"))
+    return SearchIndex()
+
+
+def build(*dbs: Dict[str, List[dict]]) -> SearchIndex:
+    """Build a fresh index from job databases, e.g. the active DB and archive."""
+    index = SearchIndex()
+    for db in dbs:
+        for site, jobs in db.items():
+            for job in jobs:
+                index.add(site, job)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the historical job database.")
+    parser.add_argument("query", nargs="?", default="", help='terms and "quoted phrases"')
+    parser.add_argument("--site", help="only jobs from this site")
+    parser.add_argument("--since", help="first seen on or after this ISO date")
+    parser.add_argument("--until", help="first seen on or before this ISO date")
+    parser.add_argument("--new", action="store_true", help="only jobs new in the latest run")
+    parser.add_argument("--all", action="store_true", help="include closed postings")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from the job database")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.rebuild or not os.path.exists(INDEX_PATH):
+        import job_db
+        index = build(job_db.load_db(), job_db.load_db(job_db.ARCHIVE_PATH))
+        index.save()
+    else:
+        index = load()
+    loaded = time.perf_counter()
+    results = index.search(args.query, args.site, args.since, args.until, args.new, args.all)
+    done = time.perf_counter()
+    for doc in results:
+        status = f"closed {doc['removed'][:10]}" if "removed" in doc else "open"
+        print(f"{doc.get('first_seen', '')[:10]:10}  {doc['site']:16} {status:17} {doc.get('title', '')} | {doc['url']}")
+    print(f"{len(results)} jobs ({(done - start) * 1000:.1f} ms: "
+          f"{(loaded - start) * 1000:.1f} ms loading, {(done - loaded) * 1000:.1f} ms searching)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@
 import logging
 import os
 import time
-import yaml
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,6 +11,9 @@ from selenium.common.exceptions import TimeoutException, JavascriptException, No
 from selenium.webdriver.chrome.options import Options as ChromeOptions # For console logs
 from bs4 import BeautifulSoup
 
+from utils import matching
+from utils import output
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -24,6 +26,8 @@ KEYWORDS = [
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://lanl.jobs"
+
 def get_browser_console_logs(driver):
     """Helper function to retrieve and log browser console messages."""
     try:
@@ -220,7 +224,7 @@ def fetch_jobs():
 
     try:
         logger.info("LANL: Navigating to job search page.")
-        driver.get("https://lanl.jobs/search/searchjobs")
+        driver.get(f"{BASE_URL}/search/searchjobs")
         
         # It's good practice to maximize window, sometimes elements behave differently
         driver.maximize_window()
@@ -276,15 +280,15 @@ def fetch_jobs():
         for row_idx, row in enumerate(rows):
             try:
                 title_span = row.select_one("td.title-column span")
-                title = title_span.get_text(strip=True) if title_span else None
+                title = matching.clean_title(title_span.get_text(strip=True), "lanl") if title_span else None
                 
                 url_relative = row.get("data-href")
                 url = None
                 if url_relative:
                     if url_relative.startswith('/'):
-                        url = f"https://lanl.jobs{url_relative}"
+                        url = f"{BASE_URL}{url_relative}"
                     elif not url_relative.startswith('http'):
-                         url = f"https://lanl.jobs/{url_relative}"
+                         url = f"{BASE_URL}/{url_relative}"
                     else:
                         url = url_relative
 
@@ -294,7 +298,7 @@ def fetch_jobs():
 
                 all_titles.append(title)
 
-                if any(keyword.lower() in title.lower() for keyword in KEYWORDS):
+                if matching.matches(title, KEYWORDS, "lanl"):
                     jobs.append({"title": title, "url": url})
                     logger.info(f"LANL: Match found -> {title} | URL: {url}")
 
@@ -320,13 +324,7 @@ def fetch_jobs():
         if 'driver' in locals() and driver:
             driver.quit()
         
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "lanl_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
-        logger.info(f"LANL: Job data written to {output_path}")
+        output.write_site_output("lanl", all_titles, jobs)
 
     return jobs
 
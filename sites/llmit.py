@@ -1,13 +1,14 @@
 import logging
-import os
 import time
-import yaml
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
+from utils import matching
+from utils import output
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -20,13 +21,15 @@ KEYWORDS = [
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://careers.ll.mit.edu"
+
 def fetch_jobs():
     jobs = []
     all_titles = []
     driver = webdriver.Chrome()
 
     try:
-        driver.get("https://careers.ll.mit.edu/search")
+        driver.get(f"{BASE_URL}/search")
 
         visited_pages = set()
 
@@ -44,15 +47,15 @@ def fetch_jobs():
             for row in rows:
                 try:
                     title_tag = row.select_one("td.colTitle a.jobTitle-link")
-                    title = title_tag.get_text(strip=True) if title_tag else None
-                    url = "https://careers.ll.mit.edu" + title_tag["href"] if title_tag else None
+                    title = matching.clean_title(title_tag.get_text(strip=True), "llmit") if title_tag else None
+                    url = BASE_URL + title_tag["href"] if title_tag else None
 
                     if not title or not url:
                         continue
 
                     all_titles.append(title)
 
-                    if any(keyword in title.lower() for keyword in KEYWORDS):
+                    if matching.matches(title, KEYWORDS, "llmit"):
                         jobs.append({"title": title, "url": url})
                         logger.info(f"LLMIT: Match found -> {title}")
 
@@ -98,10 +101,6 @@ def fetch_jobs():
     finally:
         driver.quit()
 
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "llmit_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
-        logger.info(f"LLMIT: Job data written to {output_path}")
+        output.write_site_output("llmit", all_titles, jobs)
 
     return jobs
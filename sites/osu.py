@@ -1,85 +1,90 @@
 import logging
-import os
 import time
-import yaml
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils import fanout
+from utils import matching
+from utils import output
+
 logger = logging.getLogger("osu")
 
 KEYWORDS = ["software", "firmware", "embedded", "robotics", "autonomy"]
 BASE_URL = "https://osu.wd1.myworkdayjobs.com/OSUCareers"
+# Browsers held while searching, counted against main.BROWSERS
+BROWSERS = fanout.MAX_WORKERS
+# Server-side searches; results are merged and deduplicated by URL
+SEARCH_QUERIES = ["embedded", "firmware", "software", "robotics", "autonomy"]
+
+
+def _search(driver, keyword):
+    """Run one keyword search and return every posting it lists."""
+    results = []
+    logger.info(f"OSU: Navigating to {BASE_URL} for '{keyword}'")
+    driver.get(BASE_URL)
+
+    # Wait for the keyword search box to appear
+    search_box = WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-automation-id='keywordSearchInput']"))
+    )
+
+    # Clear, enter search keyword, and submit
+    search_box.clear()
+    search_box.send_keys(keyword)
+    search_box.send_keys(Keys.RETURN)
+
+    # Wait for results to appear
+    WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "ul[role='list']"))
+    )
+    time.sleep(2)
+
+    while True:
+        links = driver.find_elements(By.CSS_SELECTOR, "a[data-automation-id='jobTitle']")
+        logger.info(f"OSU: Found {len(links)} job links on this page for '{keyword}'")
+
+        for link in links:
+            results.append({"title": matching.clean_title(link.text, "osu"), "url": link.get_attribute("href")})
+
+        try:
+            next_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='next']")
+            if "disabled" in next_button.get_attribute("class"):
+                logger.info(f"OSU: No more pages for '{keyword}'. Reached the end.")
+                break
+            else:
+                logger.info("OSU: Moving to next page")
+                next_button.click()
+                WebDriverWait(driver, 15).until(
+                    EC.staleness_of(links[0])  # Wait until new page loads
+                )
+        except Exception:
+            logger.info("OSU: No 'next' button found or failed to click. Ending pagination.")
+            break
+
+    return results
 
 
-def fetch_jobs():
+def fetch_jobs(queries=None):
     jobs = []
     all_titles = []
-    logger.info("OSU: Starting Selenium WebDriver")
-
-    driver = webdriver.Chrome()
+    queries = queries or SEARCH_QUERIES
+    logger.info(f"OSU: Running {len(queries)} searches")
 
     try:
-        logger.info(f"OSU: Navigating to {BASE_URL}")
-        driver.get(BASE_URL)
-
-        # Wait for the keyword search box to appear
-        search_box = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-automation-id='keywordSearchInput']"))
-        )
-
-        # Clear, enter search keyword, and submit
-        keyword = "embedded"
-        search_box.clear()
-        search_box.send_keys(keyword)
-        search_box.send_keys(Keys.RETURN)
-
-        # Wait for results to appear
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul[role='list']"))
-        )
-        time.sleep(2)
-
-        while True:
-            links = driver.find_elements(By.CSS_SELECTOR, "a[data-automation-id='jobTitle']")
-            logger.info(f"OSU: Found {len(links)} job links on this page")
-
-            for link in links:
-                title = link.text.strip()
-                href = link.get_attribute("href")
-                all_titles.append(title)
-                if any(keyword in title.lower() for keyword in KEYWORDS):
-                    logger.info(f"OSU: Matched job - {title}")
-                    jobs.append({"title": title, "url": href})
-
-            try:
-                next_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='next']")
-                if "disabled" in next_button.get_attribute("class"):
-                    logger.info("OSU: No more pages. Reached the end.")
-                    break
-                else:
-                    logger.info("OSU: Moving to next page")
-                    next_button.click()
-                    WebDriverWait(driver, 15).until(
-                        EC.staleness_of(links[0])  # Wait until new page loads
-                    )
-            except Exception:
-                logger.info("OSU: No 'next' button found or failed to click. Ending pagination.")
-                break
+        for posting in fanout.run_queries(_search, queries):
+            title = posting["title"]
+            all_titles.append(title)
+            if matching.matches(title, KEYWORDS, "osu"):
+                logger.info(f"OSU: Matched job - {title}")
+                jobs.append(posting)
 
     except Exception as e:
         logger.error(f"OSU: Failed to fetch jobs - {e}")
 
     finally:
-        driver.quit()
-
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "osu_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
-        logger.info(f"OSU: Job data written to {output_path}")
+        output.write_site_output("osu", all_titles, jobs)
 
     return jobs
 
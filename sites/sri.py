@@ -1,13 +1,13 @@
-# Fix for removing 'Title' prefix from job titles in SRI fetcher
 import logging
-import os
-import yaml
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
+from utils import matching
+from utils import output
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -20,6 +20,8 @@ KEYWORDS = [
 
 logger = logging.getLogger(__name__)
 
+SEARCH_URL = "https://careers-sri.icims.com/jobs/search?ss=1&searchRelation=keyword_all"
+
 
 def fetch_jobs():
     jobs = []
@@ -27,7 +29,7 @@ def fetch_jobs():
     driver = webdriver.Chrome()
 
     try:
-        driver.get("https://careers-sri.icims.com/jobs/search?ss=1&searchRelation=keyword_all")
+        driver.get(SEARCH_URL)
 
         WebDriverWait(driver, 10).until(
             EC.frame_to_be_available_and_switch_to_it((By.ID, "icims_content_iframe"))
@@ -43,19 +45,15 @@ def fetch_jobs():
         for row in rows:
             try:
                 title_tag = row.select_one("a")
-                title = title_tag.get_text(strip=True) if title_tag else None
+                title = matching.clean_title(title_tag.get_text(strip=True), "sri") if title_tag else None
                 url = title_tag["href"] if title_tag else None
 
                 if not title or not url:
                     continue
 
-                # Remove 'Title' prefix if it exists
-                if title.lower().startswith("title"):
-                    title = title[5:].strip()
-
                 all_titles.append(title)
 
-                if any(keyword in title.lower() for keyword in KEYWORDS):
+                if matching.matches(title, KEYWORDS, "sri"):
                     jobs.append({"title": title, "url": url})
                     logger.info(f"SRI: Match found -> {title}")
 
@@ -68,10 +66,6 @@ def fetch_jobs():
     finally:
         driver.quit()
 
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "sri_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
-        logger.info(f"SRI: Job data written to {output_path}")
+        output.write_site_output("sri", all_titles, jobs)
 
     return jobs
@@ -1,58 +1,63 @@
-import os
-import yaml
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import asyncio
+import logging
+from urllib.parse import urljoin
+
 from bs4 import BeautifulSoup
 
-def fetch_jobs():
-    """Scrape Southwest Research Institute job postings."""
+import fetch_engine
+from utils import matching
+from utils import output
+
+logger = logging.getLogger(__name__)
+
+# The search form submits to this GET URL, so no browser is needed
+RESULTS_URL = (
+    "https://resapp.swri.org/ResApp/Job_Search_Results.aspx"
+    "?EMPLOYMENT_STATUS=Salaried&WORK_LOCATION=All+Locations&JOB_CATEGORY=All+Categories"
+)
+FETCH_MODE = "http"
+
+# Keywords used to filter relevant job postings
+KEYWORDS = ["embedded", "software", "automotive"]
+
+
+def _parse(page: str, jobs: list, all_titles: list) -> None:
+    """Collect titles and matching jobs from the results page (CPU-bound)."""
+    # Parse the results table with BeautifulSoup
+    soup = BeautifulSoup(page, "html.parser")
+    for row in soup.select("table#tblHistory tr")[1:]:
+        columns = row.find_all("td")
+        if not columns:
+            continue
+        title = matching.clean_title(columns[1].get_text(strip=True), "swri")
+        link_tag = columns[1].find("a")
+        link = urljoin(RESULTS_URL, link_tag["href"])
+        all_titles.append(title)  # Add title to the list
 
-    # Keywords used to filter relevant job postings
-    keywords = ["embedded", "software", "automotive"]
+        # Check if any keyword is in the title
+        if matching.matches(title, KEYWORDS, "swri"):
+            jobs.append({"title": title, "url": link})
 
-    # Set up the Selenium WebDriver (ensure the appropriate driver is installed)
-    driver = webdriver.Chrome()  # or webdriver.Firefox(), etc.
-    driver.get("https://resapp.swri.org/ResApp/Job_Search.aspx")
+
+async def fetch_jobs_async(engine: fetch_engine.FetchEngine):
+    """Scrape Southwest Research Institute job postings."""
 
     jobs = []
     all_titles = []  # To store all job titles for logging
 
     try:
-        # Click the 'Search' button
-        search_button = driver.find_element(By.ID, "btnSearch")
-        search_button.click()
-
-        # Wait for the results page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "tblHistory"))
-        )
-
-        # Parse the page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        for row in soup.select("table#tblHistory tr")[1:]:
-            columns = row.find_all("td")
-            if not columns:
-                continue
-            title = columns[1].get_text(strip=True)
-            link_tag = columns[1].find("a")
-            link = link_tag["href"]
-            all_titles.append(title)  # Add title to the list
-
-            # Check if any keyword is in the title
-            if any(
-                keyword.lower() in title.lower()
-                for keyword in keywords
-            ):
-                jobs.append({"title": title, "url": link})
+        page = await engine.text(RESULTS_URL)
+        # Parsing and writing run off the event loop so other sites keep fetching
+        await asyncio.to_thread(_parse, page, jobs, all_titles)
 
-    finally:
-        driver.quit()
+    except Exception as e:
+        logger.error(f"SWRI: Error while fetching jobs - {e}")
 
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "swri_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
+    finally:
+        await asyncio.to_thread(output.write_site_output, "swri", all_titles, jobs)
 
     return jobs
+
+
+def fetch_jobs():
+    return fetch_engine.run(fetch_jobs_async)
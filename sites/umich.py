@@ -1,12 +1,13 @@
 import logging
-import os
-import yaml
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
+from utils import matching
+from utils import output
+
 logging.basicConfig(
     level=logging.INFO,  # Set the logging level to INFO
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"  # Define the log format
@@ -19,6 +20,8 @@ KEYWORDS = [
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://careers.umich.edu"
+
 def fetch_jobs():
     jobs = []
     all_titles = []
@@ -29,7 +32,7 @@ def fetch_jobs():
         # https://careers.umich.edu/ performs a redirect that Selenium sometimes
         # fails to treat as secure which results in an error.  Loading the
         # dedicated search page avoids this issue.
-        driver.get("https://careers.umich.edu/search-jobs")
+        driver.get(f"{BASE_URL}/search-jobs")
 
         # Click the "Search" button to load all jobs without any filters.  This
         # button has the id "edit-submit-job-search" and must be clicked before
@@ -55,11 +58,11 @@ def fetch_jobs():
                 if not link_tag:
                     continue
 
-                title = link_tag.get_text(strip=True)
-                url = "https://careers.umich.edu" + link_tag["href"]
+                title = matching.clean_title(link_tag.get_text(strip=True), "umich")
+                url = BASE_URL + link_tag["href"]
                 all_titles.append(title)
 
-                if any(keyword in title.lower() for keyword in KEYWORDS):
+                if matching.matches(title, KEYWORDS, "umich"):
                     jobs.append({"title": title, "url": url})
                     logger.info(f"UMICH: Match found -> {title}")
 
@@ -78,11 +81,6 @@ def fetch_jobs():
     finally:
         driver.quit()
 
-        # Save titles
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "umich_jobs.yaml")
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump({"all_titles": all_titles, "jobs": jobs}, f, allow_unicode=True)
-        logger.info(f"UMICH: Job data written to {output_path}")
+        output.write_site_output("umich", all_titles, jobs)
 
     return jobs
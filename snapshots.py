@@ -0,0 +1,207 @@
+"""Per-site history of every run's ``all_titles``, stored as compressed deltas.
+
+Each site directory holds the full title list of the oldest retained run
+(``base``), one delta per later run (titles added/removed versus the run
+before), the latest full list (``head``) and an ``index.json``. Diffing two
+runs composes the deltas between them, so it costs time proportional to what
+changed rather than to the board size.
+
+    python snapshots.py list lanl
+    python snapshots.py diff lanl -2 -1      # previous run vs latest
+    python snapshots.py diff lanl 3 10
+"""
+import argparse
+import difflib
+import gzip
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils import output
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "snapshots")
+# Older runs are folded into the base once a site has more than this many
+MAX_RUNS = 200
+RENAME_RATIO = 0.75
+
+
+def _site_dir(site: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, site)
+
+
+def _read(path: str):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(path: str, data) -> None:
+    with output.atomic_write(path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            f.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _load_index(site: str) -> dict:
+    path = os.path.join(_site_dir(site), "index.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"base": None, "runs": []}
+
+
+def _save_index(site: str, index: dict) -> None:
+    with output.atomic_write(os.path.join(_site_dir(site), "index.json")) as f:
+        json.dump(index, f, indent=1)
+
+
+def _delta(old: Counter, new: Counter) -> dict:
+    return {"added": sorted((new - old).elements()), "removed": sorted((old - new).elements())}
+
+
+def record(site: str, titles: List[str], now: Optional[str] = None) -> Optional[int]:
+    """Store ``titles`` as the next run of ``site`` and return its run number.
+
+    Empty title lists are treated as failed fetches and not recorded.
+    """
+    if not titles:
+        return None
+    os.makedirs(_site_dir(site), exist_ok=True)
+    index = _load_index(site)
+    head_path = os.path.join(_site_dir(site), "head.json.gz")
+    run = index["runs"][-1]["run"] + 1 if index["runs"] else 1
+    entry = {"run": run, "time": now or datetime.now().isoformat(timespec="seconds"), "count": len(titles)}
+    if index["base"] is None:
+        _write(os.path.join(_site_dir(site), "base.json.gz"), titles)
+        index["base"] = run
+    else:
+        delta = _delta(Counter(_read(head_path)), Counter(titles))
+        _write(os.path.join(_site_dir(site), f"{run}.json.gz"), delta)
+        entry["added"], entry["removed"] = len(delta["added"]), len(delta["removed"])
+    _write(head_path, titles)
+    index["runs"].append(entry)
+    _prune(site, index)
+    _save_index(site, index)
+    return run
+
+
+def _prune(site: str, index: dict) -> None:
+    """Fold the oldest runs into the base so at most ``MAX_RUNS`` remain."""
+    excess = len(index["runs"]) - MAX_RUNS
+    if excess <= 0:
+        return
+    directory = _site_dir(site)
+    state = Counter(_read(os.path.join(directory, "base.json.gz")))
+    for entry in index["runs"][1:excess + 1]:
+        path = os.path.join(directory, f"{entry['run']}.json.gz")
+        delta = _read(path)
+        state.update(delta["added"])
+        state.subtract(delta["removed"])
+        os.remove(path)
+    _write(os.path.join(directory, "base.json.gz"), sorted(state.elements()))
+    index["runs"] = index["runs"][excess:]
+    # The oldest retained run is now the base, not a delta
+    index["runs"][0].pop("added", None)
+    index["runs"][0].pop("removed", None)
+    index["base"] = index["runs"][0]["run"]
+
+
+def runs(site: str) -> List[dict]:
+    return _load_index(site)["runs"]
+
+
+def latest_titles(site: str) -> List[str]:
+    """All titles of the latest recorded run of ``site`` (empty if none)."""
+    path = os.path.join(_site_dir(site), "head.json.gz")
+    return _read(path) if os.path.exists(path) else []
+
+
+def _resolve(index: dict, run: int) -> int:
+    numbers = [entry["run"] for entry in index["runs"]]
+    if not numbers:
+        raise ValueError("no runs recorded")
+    if run < 0:
+        if -run > len(numbers):
+            raise ValueError(f"only {len(numbers)} runs recorded")
+        return numbers[run]
+    if run not in numbers:
+        raise ValueError(f"run {run} is not retained (runs {numbers[0]}-{numbers[-1]} are)")
+    return run
+
+
+def diff(site: str, old: int, new: int) -> Dict[str, list]:
+    """Titles added, removed and renamed between two runs of ``site``.
+
+    Negative run numbers count from the latest run (-1 is the latest).
+    ``renamed`` holds ``[old_title, new_title]`` pairs that look like edits
+    of the same posting; they are not repeated in ``added``/``removed``.
+    """
+    index = _load_index(site)
+    old, new = _resolve(index, old), _resolve(index, new)
+    lo, hi = sorted((old, new))
+    net = Counter()
+    for run in range(lo + 1, hi + 1):
+        delta = _read(os.path.join(_site_dir(site), f"{run}.json.gz"))
+        net.update(delta["added"])
+        net.subtract(delta["removed"])
+    if new < old:
+        net = Counter({title: -count for title, count in net.items()})
+    added = sorted(Counter({t: c for t, c in net.items() if c > 0}).elements())
+    removed = sorted(Counter({t: -c for t, c in net.items() if c < 0}).elements())
+    return _pair_renames(added, removed)
+
+
+def _pair_renames(added: List[str], removed: List[str]) -> Dict[str, list]:
+    renamed = []
+    remaining = list(added)
+    still_removed = []
+    for old_title in removed:
+        matcher = difflib.SequenceMatcher(None, old_title.lower())
+        best, best_ratio = None, RENAME_RATIO
+        for i, new_title in enumerate(remaining):
+            matcher.set_seq2(new_title.lower())
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = i, ratio
+        if best is None:
+            still_removed.append(old_title)
+        else:
+            renamed.append([old_title, remaining.pop(best)])
+    return {"added": remaining, "removed": still_removed, "renamed": renamed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect per-site run snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_parser = sub.add_parser("list", help="list the retained runs of a site")
+    list_parser.add_argument("site")
+    diff_parser = sub.add_parser("diff", help="compare two runs of a site")
+    diff_parser.add_argument("site")
+    diff_parser.add_argument("old", type=int, nargs="?", default=-2)
+    diff_parser.add_argument("new", type=int, nargs="?", default=-1)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        entries = runs(args.site)
+        if not entries:
+            parser.error(f"{args.site}: no runs recorded")
+        for entry in entries:
+            change = f"+{entry['added']} -{entry['removed']}" if "added" in entry else "base"
+            print(f"{entry['run']:>5}  {entry['time']}  {entry['count']:>6} titles  {change}")
+        return
+    try:
+        result = diff(args.site, args.old, args.new)
+    except ValueError as e:
+        parser.error(f"{args.site}: {e}")
+    for title in result["added"]:
+        print(f"+ {title}")
+    for title in result["removed"]:
+        print(f"- {title}")
+    for old_title, new_title in result["renamed"]:
+        print(f"~ {old_title} -> {new_title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""Per-site fetch tasks shared between a coordinator (``main.py --queue``) and
+``worker.py`` processes.
+
+``open_queue`` picks the backend from the location: a ``redis://`` URL gives
+a ``RedisTaskQueue`` that workers on any number of machines can share; a file
+path gives a ``TaskQueue`` in SQLite, for workers on the same host only.
+"""
+import abc
+import json
+import logging
+import sqlite3
+import time
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+# Tasks not finished this long after being queued are failed instead of claimed
+MAX_AGE = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    site TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id, state);
+"""
+
+
+def open_queue(location: str):
+    """``RedisTaskQueue`` for ``redis://``/``rediss://`` URLs, else a SQLite ``TaskQueue``."""
+    if location.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTaskQueue(location)
+    return TaskQueue(location)
+
+
+class _Queue(abc.ABC):
+    """Interface of both backends, and the result collection they share."""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def enqueue(self, run_id: str, site: str, payload: Optional[dict] = None) -> int:
+        """Queue a task for ``site`` and return its id."""
+
+    @abc.abstractmethod
+    def claim(self, owner: str, sites: Optional[List[str]] = None, lease: float = LEASE_SECONDS,
+              max_attempts: int = MAX_ATTEMPTS) -> Optional[Tuple[int, str, dict]]:
+        """Lease the oldest runnable task, returning ``(id, site, payload)``."""
+
+    @abc.abstractmethod
+    def heartbeat(self, task_id: int, owner: str, lease: float = LEASE_SECONDS) -> bool:
+        """Extend ``owner``'s lease; False once the task was reassigned."""
+
+    @abc.abstractmethod
+    def complete(self, task_id: int, owner: str, result: dict) -> bool:
+        """Store the result; False (and nothing stored) if ``owner`` lost the lease."""
+
+    @abc.abstractmethod
+    def fail(self, task_id: int, owner: str, error: str, max_attempts: int = MAX_ATTEMPTS) -> None:
+        """Release a task for retry, or mark it failed after ``max_attempts``."""
+
+    @abc.abstractmethod
+    def _tasks(self, run_id: str) -> List[Tuple[int, str, str, Optional[str], Optional[str]]]:
+        """``(id, site, state, result, error)`` of every task of ``run_id``."""
+
+    @abc.abstractmethod
+    def _abandon(self, run_id: str, error: str) -> None:
+        """Fail the unfinished tasks of ``run_id`` so no worker picks them up later."""
+
+    def results(self, run_id: str, timeout: float = 3600,
+                poll: float = 2.0) -> Iterator[Tuple[str, list, list]]:
+        """Yield ``(site, jobs, all_titles)`` once per task of ``run_id`` as tasks finish.
+
+        Failed tasks and tasks still open at ``timeout`` yield empty lists;
+        the latter are marked failed so workers stop claiming them.
+        """
+        yielded = set()
+        deadline = time.time() + timeout
+        while True:
+            rows = self._tasks(run_id)
+            for task_id, site, state, result, error in rows:
+                if task_id in yielded or state not in ("done", "failed"):
+                    continue
+                yielded.add(task_id)
+                if state == "failed":
+                    logger.error(f"{site}: task {task_id} failed - {error}")
+                data = json.loads(result) if result else {}
+                yield site, data.get("jobs", []), data.get("all_titles", [])
+            if len(yielded) == len(rows):
+                return
+            if time.time() > deadline:
+                self._abandon(run_id, f"coordinator gave up after {timeout}s")
+                for task_id, site, *_ in rows:
+                    if task_id not in yielded:
+                        logger.error(f"{site}: task {task_id} did not finish within {timeout}s")
+                        yield site, [], []
+                return
+            time.sleep(poll)
+
+
+class TaskQueue(_Queue):
+    """Per-site fetch tasks in a SQLite file shared by processes on one host.
+
+    Workers claim a task with a lease and must finish (or ``heartbeat``) before
+    it expires; expired leases are handed to the next worker that asks, until
+    a task has used ``MAX_ATTEMPTS``. Only the current lease owner can complete
+    a task, so a late result from a worker whose lease was taken over is
+    dropped instead of merged twice.
+
+    SQLite locking is not reliable on network filesystems, so the file must be
+    on a local disk; use ``RedisTaskQueue`` to spread workers over machines.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "created" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN created REAL NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, run_id: str, site: str, payload: Optional[dict] = None) -> int:
+        cursor = self._conn.execute(
+            "INSERT INTO tasks (run_id, site, payload, created) VALUES (?, ?, ?, ?)",
+            (run_id, site, json.dumps(payload or {}), time.time()),
+        )
+        return cursor.lastrowid
+
+    def claim(self, owner: str, sites: Optional[List[str]] = None, lease: float = LEASE_SECONDS,
+              max_attempts: int = MAX_ATTEMPTS) -> Optional[Tuple[int, str, dict]]:
+        """Lease the oldest runnable task, returning ``(id, site, payload)``.
+
+        Expired leases that already used ``max_attempts``, and tasks older
+        than ``MAX_AGE``, are marked failed in the same transaction.
+        """
+        now = time.time()
+        runnable = "(state = 'pending' OR (state = 'leased' AND lease_expires < ?))"
+        query = f"SELECT id, site, payload FROM tasks WHERE {runnable}"
+        params = [now]
+        if sites:
+            query += f" AND site IN ({', '.join('?' * len(sites))})"
+            params.extend(sites)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE tasks SET state = 'failed', owner = NULL, lease_expires = NULL, "
+                "error = 'lease expired after ' || attempts || ' attempts' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, max_attempts),
+            )
+            self._conn.execute(
+                f"UPDATE tasks SET state = 'failed', owner = NULL, lease_expires = NULL, "
+                f"error = 'expired before it could run' WHERE {runnable} AND created < ?",
+                (now, now - MAX_AGE),
+            )
+            task = self._conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if task is not None:
+                self._conn.execute(
+                    "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (owner, now + lease, task[0]),
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if task is None:
+            return None
+        return task[0], task[1], json.loads(task[2])
+
+    def heartbeat(self, task_id: int, owner: str, lease: float = LEASE_SECONDS) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE tasks SET lease_expires = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+            (time.time() + lease, task_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: int, owner: str, result: dict) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE tasks SET state = 'done', result = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+            (json.dumps(result), task_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, owner: str, error: str, max_attempts: int = MAX_ATTEMPTS) -> None:
+        """Release a task for retry, or mark it failed after ``max_attempts``."""
+        self._conn.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, owner = NULL, lease_expires = NULL WHERE id = ? AND owner = ? AND state = 'leased'",
+            (max_attempts, error, task_id, owner),
+        )
+
+    def _tasks(self, run_id: str):
+        return self._conn.execute(
+            "SELECT id, site, state, result, error FROM tasks WHERE run_id = ?", (run_id,)
+        ).fetchall()
+
+    def _abandon(self, run_id: str, error: str) -> None:
+        self._conn.execute(
+            "UPDATE tasks SET state = 'failed', error = ?, owner = NULL, lease_expires = NULL "
+            "WHERE run_id = ? AND state IN ('pending', 'leased')",
+            (error, run_id),
+        )
+
+
+# Each task is a hash at <prefix>:task:<id>; <prefix>:open is a sorted set of
+# unfinished task IDs and <prefix>:run:<run_id> lists the tasks of a run.
+# State changes run as Lua scripts so they are atomic on the server.
+_CLAIM = """
+local now, lease, max_attempts, cutoff = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local owner, prefix = ARGV[5], ARGV[6]
+local wanted = {}
+for i = 7, #ARGV do wanted[ARGV[i]] = true end
+for _, id in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    local key = prefix .. ':task:' .. id
+    local t = redis.call('HMGET', key, 'state', 'site', 'lease_expires', 'attempts', 'created')
+    if not t[1] then
+        redis.call('ZREM', KEYS[1], id)
+    else
+        local expired = t[1] == 'leased' and tonumber(t[3]) < now
+        if t[1] == 'pending' or expired then
+            if expired and tonumber(t[4]) >= max_attempts then
+                redis.call('HSET', key, 'state', 'failed', 'error', 'lease expired after ' .. t[4] .. ' attempts')
+                redis.call('ZREM', KEYS[1], id)
+            elseif tonumber(t[5]) < cutoff then
+                redis.call('HSET', key, 'state', 'failed', 'error', 'expired before it could run')
+                redis.call('ZREM', KEYS[1], id)
+            elseif #ARGV < 7 or wanted[t[2]] then
+                redis.call('HSET', key, 'state', 'leased', 'owner', owner, 'lease_expires', tostring(now + lease))
+                redis.call('HINCRBY', key, 'attempts', 1)
+                return {id, t[2], redis.call('HGET', key, 'payload')}
+            end
+        end
+    end
+end
+return false
+"""
+
+# KEYS[1] task hash, KEYS[2] open set; ARGV[1] owner, ARGV[2] action, ARGV[3..] arguments
+_UPDATE = """
+local t = redis.call('HMGET', KEYS[1], 'state', 'owner', 'attempts')
+if t[1] ~= 'leased' or t[2] ~= ARGV[1] then return 0 end
+local id = string.match(KEYS[1], '([^:]+)$')
+if ARGV[2] == 'heartbeat' then
+    redis.call('HSET', KEYS[1], 'lease_expires', ARGV[3])
+elseif ARGV[2] == 'complete' then
+    redis.call('HSET', KEYS[1], 'state', 'done', 'result', ARGV[3])
+    redis.call('ZREM', KEYS[2], id)
+elseif tonumber(t[3]) >= tonumber(ARGV[4]) then
+    redis.call('HSET', KEYS[1], 'state', 'failed', 'error', ARGV[3], 'owner', '')
+    redis.call('ZREM', KEYS[2], id)
+else
+    redis.call('HSET', KEYS[1], 'state', 'pending', 'error', ARGV[3], 'owner', '')
+end
+return 1
+"""
+
+_ABANDON = """
+for _, id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local key = ARGV[1] .. ':task:' .. id
+    local state = redis.call('HGET', key, 'state')
+    if state == 'pending' or state == 'leased' then
+        redis.call('HSET', key, 'state', 'failed', 'error', ARGV[2], 'owner', '')
+        redis.call('ZREM', KEYS[2], id)
+    end
+end
+return 0
+"""
+
+
+class RedisTaskQueue(_Queue):
+    """The ``TaskQueue`` protocol on a Redis server, for workers on several machines.
+
+    Needs the ``redis`` package. Task keys expire ``2 * MAX_AGE`` after being
+    queued, so finished runs do not accumulate on the server.
+    """
+
+    def __init__(self, url: str, prefix: str = "h1b:tasks"):
+        import redis
+
+        self.path = url
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._open = f"{prefix}:open"
+        self._claim = self._redis.register_script(_CLAIM)
+        self._update = self._redis.register_script(_UPDATE)
+        self._abandon_script = self._redis.register_script(_ABANDON)
+
+    def close(self) -> None:
+        self._redis.close()
+
+    def _key(self, task_id) -> str:
+        return f"{self.prefix}:task:{task_id}"
+
+    def enqueue(self, run_id: str, site: str, payload: Optional[dict] = None) -> int:
+        task_id = self._redis.incr(f"{self.prefix}:next_id")
+        run_key = f"{self.prefix}:run:{run_id}"
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key(task_id), mapping={
+            "run_id": run_id, "site": site, "payload": json.dumps(payload or {}),
+            "state": "pending", "attempts": 0, "created": time.time(),
+        })
+        pipe.expire(self._key(task_id), 2 * MAX_AGE)
+        pipe.rpush(run_key, task_id)
+        pipe.expire(run_key, 2 * MAX_AGE)
+        pipe.zadd(self._open, {task_id: task_id})
+        pipe.execute()
+        return task_id
+
+    def claim(self, owner: str, sites: Optional[List[str]] = None, lease: float = LEASE_SECONDS,
+              max_attempts: int = MAX_ATTEMPTS) -> Optional[Tuple[int, str, dict]]:
+        """Lease the oldest runnable task, returning ``(id, site, payload)``."""
+        now = time.time()
+        task = self._claim(
+            keys=[self._open],
+            args=[now, lease, max_attempts, now - MAX_AGE, owner, self.prefix, *(sites or [])],
+        )
+        if not task:
+            return None
+        return int(task[0]), task[1], json.loads(task[2])
+
+    def heartbeat(self, task_id: int, owner: str, lease: float = LEASE_SECONDS) -> bool:
+        return self._update(keys=[self._key(task_id), self._open],
+                            args=[owner, "heartbeat", time.time() + lease]) == 1
+
+    def complete(self, task_id: int, owner: str, result: dict) -> bool:
+        return self._update(keys=[self._key(task_id), self._open],
+                            args=[owner, "complete", json.dumps(result)]) == 1
+
+    def fail(self, task_id: int, owner: str, error: str, max_attempts: int = MAX_ATTEMPTS) -> None:
+        """Release a task for retry, or mark it failed after ``max_attempts``."""
+        self._update(keys=[self._key(task_id), self._open], args=[owner, "fail", error, max_attempts])
+
+    def _tasks(self, run_id: str):
+        ids = self._redis.lrange(f"{self.prefix}:run:{run_id}", 0, -1)
+        pipe = self._redis.pipeline()
+        for task_id in ids:
+            pipe.hmget(self._key(task_id), "site", "state", "result", "error")
+        return [(int(task_id), *fields) for task_id, fields in zip(ids, pipe.execute())]
+
+    def _abandon(self, run_id: str, error: str) -> None:
+        self._abandon_script(keys=[f"{self.prefix}:run:{run_id}", self._open], args=[self.prefix, error])
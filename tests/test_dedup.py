@@ -0,0 +1,75 @@
+import pytest
+
+import dedup
+
+NOW = "2026-03-01T08:00:00"
+RECENT = "2026-02-20T08:00:00"
+STALE = "2025-10-01T08:00:00"
+
+
+def _closed(site, title, removed=RECENT, **fields):
+    return dict({"title": title, "url": f"https://{site}.example/{title}", "last_seen": removed,
+                 "removed": removed}, **fields)
+
+
+def _index(*jobs):
+    index = dedup.SimilarityIndex()
+    for n, (site, job) in enumerate(jobs):
+        index.add(site, job, f"c-{n}")
+    return index
+
+
+@pytest.mark.parametrize("title", [
+    "Embedded Software Engineer",
+    "Firmware Software Engineer",
+    "Cloud Software Engineer",
+    "Research Software Engineer",
+    "Software Engineer - Robotics",
+    "Software Engineer II",
+    "Senior Software Engineer",
+])
+def test_specialty_and_level_words_are_new_openings(title):
+    index = _index(("llmit", _closed("llmit", "Software Engineer")))
+    assert index.find("llmit", {"title": title}, now=NOW) is None
+
+
+@pytest.mark.parametrize("old, new", [
+    ("Drexel University Co-op: Software Engineering", "Drexel University Co-op: Embedded Software Engineering"),
+    ("ENGINEER - RESEARCH ENGINEER -  Automotive Fuel & Lubricant Engineer",
+     "LEAD ENGINEER - SR. RESEARCH ENGINEER -  Automotive Fuel & Lubricant Engineer"),
+    ("Embedded Software Architect-Technical Staff", "Embedded System Architect-Technical Staff"),
+])
+def test_distinct_postings_from_jobs_db_stay_apart(old, new):
+    index = _index(("sri", _closed("sri", old)))
+    assert index.find("sri", {"title": new}, now=NOW) is None
+
+
+@pytest.mark.parametrize("old, new", [
+    ("Embedded Software Engineer (Tech Staff)", "Embedded Software Engineer"),
+    ("RESEARCH COMPUTER SCIENTIST - RESEARCH ENGINEER - SR. COMPUTER SCIENTIST -  Full Stack Software Developer",
+     "RESEARCH COMPUTER SCIENTIST - RESEARCH ENGINEER - SR. RESEARCH ENGINEER -  Full Stack Software Developer"),
+    ("Software Engineer", "Software Engineer"),
+])
+def test_recent_reposts_match(old, new):
+    index = _index(("llmit", _closed("llmit", old)))
+    assert index.find("llmit", {"title": new}, now=NOW) == "c-0"
+
+
+def test_postings_closed_long_ago_are_not_repost_targets():
+    index = _index(("llmit", _closed("llmit", "Software Engineer", removed=STALE)))
+    assert index.find("llmit", {"title": "Software Engineer"}, now=NOW) is None
+
+
+def test_postings_listed_in_the_same_run_are_separate_openings():
+    listed = {"title": "Software Engineer", "url": "https://llmit.example/1", "last_seen": NOW}
+    index = _index(("llmit", listed))
+    assert index.find("llmit", {"title": "Software Engineer"}, now=NOW) is None
+
+
+def test_cross_site_matches_need_descriptions():
+    index = _index(("osu", _closed("osu", "Software Engineer")))
+    assert index.find("sri", {"title": "Software Engineer"}, now=NOW) is None
+    described = _closed("osu", "Software Engineer", description="Build flight software for small satellites.")
+    index = _index(("osu", described))
+    job = {"title": "Software Engineer", "description": "Build flight software for small satellites."}
+    assert index.find("sri", job, now=NOW) == "c-0"
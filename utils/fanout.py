@@ -0,0 +1,70 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from selenium import webdriver
+
+import fetch_engine
+
+logger = logging.getLogger(__name__)
+
+# Browsers a fan-out site opens at most; sites declare it as their BROWSERS
+MAX_WORKERS = 3
+
+
+def run_queries(
+    search: Callable[[object, str], List[dict]],
+    queries: Iterable[str],
+    max_workers: int = MAX_WORKERS,
+    make_driver: Optional[Callable[[], object]] = None,
+) -> List[dict]:
+    """Run ``search(driver, query)`` for every query over a pool of drivers.
+
+    Each worker thread lazily creates one driver and reuses it for all the
+    queries it picks up, so at most ``max_workers`` browsers are open at once,
+    fewer if the fetch engine granted this fetcher a smaller browser allowance.
+    The raw results of every query are merged and deduplicated by ``url``,
+    keeping the first occurrence, before being returned.
+    """
+    make_driver = make_driver or webdriver.Chrome
+    allowance = fetch_engine.browser_allowance()
+    if allowance is not None:
+        max_workers = min(max_workers, allowance)
+    queries = list(dict.fromkeys(queries))
+    local = threading.local()
+    drivers = []
+    lock = threading.Lock()
+
+    def _driver():
+        if getattr(local, "driver", None) is None:
+            local.driver = make_driver()
+            with lock:
+                drivers.append(local.driver)
+        return local.driver
+
+    def _run(query):
+        try:
+            return search(_driver(), query)
+        except Exception as e:
+            logger.error(f"Search for '{query}' failed - {e}")
+            return []
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as pool:
+            batches = list(pool.map(_run, queries))
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f"Failed to close driver - {e}")
+
+    merged = {}
+    for query, batch in zip(queries, batches):
+        logger.info(f"Query '{query}' returned {len(batch)} postings")
+        for job in batch:
+            url = job.get("url")
+            if url and url not in merged:
+                merged[url] = job
+    return list(merged.values())
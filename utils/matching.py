@@ -0,0 +1,146 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from utils import output
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "match_cache.json")
+
+# Labels some boards render inside the title link
+SITE_PREFIXES = {
+    "sri": ("Title",),
+}
+
+_lock = threading.Lock()
+_cache = None
+# In-process state: results by raw title per profile, the profile each site
+# was registered with, and the title hashes each site looked up since the
+# last save
+_seen: Dict[str, Dict[str, bool]] = {}
+_registered: Dict[str, str] = {}
+_touched: Dict[str, Set[str]] = {}
+
+
+def clean_title(title: str, site: Optional[str] = None) -> str:
+    """Display form of a title: NFKC-normalized, single-spaced, site prefixes removed."""
+    title = " ".join(unicodedata.normalize("NFKC", title).split())
+    for prefix in SITE_PREFIXES.get(site, ()):
+        if title.lower().startswith(prefix.lower()):
+            title = title[len(prefix):].lstrip(" :")
+    return title
+
+
+def match_key(title: str) -> str:
+    """Case- and accent-folded form used for keyword matching."""
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+@functools.lru_cache(maxsize=None)
+def profile_hash(keywords: Tuple[str, ...]) -> str:
+    return hashlib.blake2b("\n".join(sorted(match_key(k) for k in keywords)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_keys(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(match_key(keyword) for keyword in keywords)
+
+
+def _title_hash(key: str) -> str:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _load():
+    global _cache
+    if _cache is None:
+        _cache = {"sites": {}, "profiles": {}, "titles": {}}
+        if os.path.exists(CACHE_PATH):
+            with open(CACHE_PATH, "r", encoding="utf-8") as f:
+                _cache = json.load(f)
+            _cache.setdefault("titles", {})
+    return _cache
+
+
+def matches(title: str, keywords: Iterable[str], site: Optional[str] = None) -> bool:
+    """True if any keyword occurs in the normalized title.
+
+    Results are memoized per keyword profile and title hash, so a title seen
+    in an earlier run, or on another site with the same keywords, is not
+    evaluated again; repeats within a process skip normalization entirely.
+    Changing a site's keywords gives it a new profile and the old profile's
+    entries are dropped on ``save`` once no site uses it. Only lookups made
+    with a ``site`` are kept past the next ``save``.
+    """
+    keywords = tuple(keywords)
+    profile = profile_hash(keywords)
+    if site and _registered.get(site) != profile:
+        with _lock:
+            _load()["sites"][site] = profile
+            _registered[site] = profile
+    seen = _seen.setdefault(profile, {})
+    result = seen.get(title)
+    if result is not None:
+        return result
+    key = match_key(title)
+    title_hash = _title_hash(key)
+    with _lock:
+        entries = _load()["profiles"].setdefault(profile, {})
+        result = entries.get(title_hash)
+        if site:
+            _touched.setdefault(site, set()).add(title_hash)
+    if result is None:
+        result = any(keyword in key for keyword in _keyword_keys(keywords))
+        with _lock:
+            entries[title_hash] = result
+    seen[title] = result
+    return result
+
+
+def forget(site: str) -> None:
+    """Discard the lookups ``site`` made since the last save (e.g. after a failed fetch).
+
+    The titles kept for it on ``save`` are then those of its last good run.
+    """
+    with _lock:
+        _touched.pop(site, None)
+
+
+def save() -> None:
+    """Persist the memo, keeping only what is still in use.
+
+    Each site looked up since the last save replaces its stored title hashes
+    with those it just looked up; sites that did not run keep theirs. A
+    profile then keeps only the titles stored for the sites using it, so the
+    file stays proportional to the boards rather than to their history,
+    and profiles no site refers to are dropped.
+    """
+    with _lock:
+        if _cache is None:
+            return
+        titles = _cache["titles"]
+        for site, hashes in _touched.items():
+            titles[site] = sorted(hashes)
+        users: Dict[str, list] = {}
+        for site, profile in _cache["sites"].items():
+            users.setdefault(profile, []).append(site)
+        profiles = {}
+        for profile, entries in _cache["profiles"].items():
+            if profile not in users:
+                continue
+            if any(site not in titles for site in users[profile]):
+                # A site that has not saved its titles yet (older cache
+                # file) could still need any of them
+                profiles[profile] = entries
+                continue
+            keep = set().union(*(titles[site] for site in users[profile]))
+            profiles[profile] = {h: r for h, r in entries.items() if h in keep}
+        _cache["profiles"] = profiles
+        _cache["titles"] = {site: hashes for site, hashes in titles.items() if site in _cache["sites"]}
+        _touched.clear()
+        _seen.clear()
+        with output.atomic_write(CACHE_PATH) as f:
+            json.dump(_cache, f, separators=(",", ":"))
@@ -1,7 +1,23 @@
-from plyer import notification
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "notify.json")
+
 
 def notify(title, message):
-        # Truncate title and message to fit within the 64-character limit
+    from plyer import notification
+
+    # Truncate title and message to fit within the 64-character limit
     max_length = 64
     truncated_title = title[:max_length]
     truncated_message = message[:max_length]
@@ -11,4 +27,195 @@ def notify(title, message):
         message=truncated_message,
         app_name="Job Watcher",
         timeout=10
-    )
\ No newline at end of file
+    )
+
+
+class DesktopSink:
+    """Desktop notification through plyer."""
+
+    def send(self, title: str, message: str, jobs: List[dict]) -> None:
+        notify(title, message)
+
+
+class FileSink:
+    """Append each digest to a text file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, title: str, message: str, jobs: List[dict]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"[{datetime.now().isoformat(timespec='seconds')}] {title}\n")
+            for job in jobs:
+                f.write(f"  {job.get('title')} | {job.get('url')}\n")
+
+
+class WebhookSink:
+    """POST each digest as JSON to a URL."""
+
+    def __init__(self, url: str, timeout: float = 10, server: Optional["LocalWebhookServer"] = None):
+        self.url = url
+        self.timeout = timeout
+        # Local stand-in receiver owned by this sink, shut down by ``close``
+        self.server = server
+
+    def send(self, title: str, message: str, jobs: List[dict]) -> None:
+        body = json.dumps({"title": title, "message": message, "jobs": jobs}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+
+
+class LocalWebhookServer:
+    """Local stand-in for a webhook receiver; logs and keeps what it receives."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        received = self.received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                received.append(payload)
+                logger.info(f"Webhook stand-in received: {payload.get('title')}")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def build_sinks(config: List[dict]) -> list:
+    """Create sinks from config entries such as ``{"type": "file", "path": ...}``.
+
+    A webhook whose ``url`` is ``"local"`` is pointed at a ``LocalWebhookServer``.
+    """
+    sinks = []
+    for entry in config:
+        kind = entry.get("type")
+        if kind == "desktop":
+            sinks.append(DesktopSink())
+        elif kind == "file":
+            sinks.append(FileSink(entry.get("path", "notifications.log")))
+        elif kind == "webhook":
+            if entry["url"] == "local":
+                server = LocalWebhookServer()
+                sinks.append(WebhookSink(server.url, server=server))
+            else:
+                sinks.append(WebhookSink(entry["url"]))
+        else:
+            logger.warning(f"Unknown notification sink: {kind}")
+    return sinks
+
+
+class Dispatcher:
+    """Background worker that turns new jobs into rate-limited digests.
+
+    ``submit`` only enqueues, so scraping never waits on a sink. The worker
+    collects everything submitted within ``window`` seconds into one digest per
+    site, and when the rate limit of ``per_minute`` digests would be exceeded
+    it merges the pending site digests into a single run digest instead. Each
+    digest is sent to every sink; a failing sink does not affect the others.
+    """
+
+    def __init__(self, sinks: list, per_minute: int = 6, window: float = 2.0):
+        self.sinks = sinks
+        self.window = window
+        self._rate = per_minute / 60.0
+        self._capacity = float(per_minute)
+        self._tokens = float(per_minute)
+        self._stamp = time.monotonic()
+        self._queue: queue.Queue = queue.Queue()
+        self._closing = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> "Dispatcher":
+        path = path or CONFIG_PATH
+        config = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        return cls(
+            build_sinks(config.get("sinks", [{"type": "desktop"}])),
+            per_minute=config.get("per_minute", 6),
+            window=config.get("window_seconds", 2.0),
+        )
+
+    def submit(self, site: str, jobs: List[dict]) -> None:
+        if jobs:
+            self._queue.put((site, list(jobs)))
+
+    def close(self, timeout: float = 30) -> None:
+        """Flush pending digests, ignoring the rate limit, and stop the worker and sinks."""
+        self._closing.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"Notifier did not finish within {timeout}s; unsent digests are lost")
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            pending: Dict[str, List[dict]] = {}
+            deadline = time.monotonic() + self.window
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    pending.setdefault(item[0], []).extend(item[1])
+                if stopping:
+                    # Drain whatever was queued before close()
+                    try:
+                        item = self._queue.get_nowait()
+                        continue
+                    except queue.Empty:
+                        break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if pending:
+                self._dispatch(pending, wait=not stopping)
+
+    def _dispatch(self, pending: Dict[str, List[dict]], wait: bool) -> None:
+        self._refill()
+        if len(pending) > 1 and len(pending) > self._tokens:
+            merged = [dict(job, site=site) for site, jobs in pending.items() for job in jobs]
+            pending = {"all sites": sorted(merged, key=lambda job: job.get("score", 0), reverse=True)}
+        if self._tokens < 1 and wait:
+            # close() cuts the wait short so shutdown never blocks on the limit
+            self._closing.wait((1 - self._tokens) / self._rate)
+            self._refill()
+        self._tokens = max(0.0, self._tokens - len(pending))
+        for site, jobs in pending.items():
+            title = f"{len(jobs)} new job{'s' if len(jobs) != 1 else ''} - {site}"
+            message = "; ".join(job.get("title", "") for job in jobs)
+            for sink in self.sinks:
+                try:
+                    sink.send(title, message, jobs)
+                except Exception as e:
+                    logger.error(f"Notification sink {type(sink).__name__} failed - {e}")
@@ -0,0 +1,90 @@
+import contextlib
+import gzip
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict, deque
+from typing import List, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# libyaml bindings are an order of magnitude faster; fall back to pure Python
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+# Also write <site>_jobs.jsonl.gz next to the YAML output (main.py --jsonl)
+JSONL = False
+
+
+@contextlib.contextmanager
+def atomic_write(path: str, mode: str = "w"):
+    """Open a temp file next to ``path`` and rename it over ``path`` on success.
+
+    Readers never see a half-written file, and a crash leaves the previous
+    version in place.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        if "b" in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, encoding="utf-8")
+        with f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_yaml(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=Loader)
+
+
+def dump_yaml(data, path: str) -> None:
+    with atomic_write(path) as f:
+        yaml.dump(data, f, Dumper=Dumper, allow_unicode=True)
+
+
+def write_site_output(site: str, all_titles: List[str], jobs: List[dict], jsonl: Optional[bool] = None) -> str:
+    """Write ``output/<site>_jobs.yaml`` with the ``all_titles`` and ``jobs`` lists.
+
+    The document is emitted with a single libyaml dump, which is several
+    times faster than dumping record by record. With ``jsonl`` a gzipped
+    JSON Lines file is written as well, one record per title with the matched
+    job's URL when there is one.
+    """
+    path = os.path.join(OUTPUT_DIR, f"{site}_jobs.yaml")
+    dump_yaml({"all_titles": all_titles, "jobs": jobs}, path)
+    logger.info(f"{site}: Job data written to {path}")
+
+    if JSONL if jsonl is None else jsonl:
+        # Repeated titles (one per opening) are paired with their jobs in
+        # listing order, so each keeps its own URL
+        urls = defaultdict(deque)
+        for job in jobs:
+            urls[job["title"]].append(job.get("url"))
+        with atomic_write(os.path.join(OUTPUT_DIR, f"{site}_jobs.jsonl.gz"), "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                for title in all_titles:
+                    pending = urls.get(title)
+                    matched = bool(pending)
+                    url = pending.popleft() if matched else None
+                    record = {"site": site, "title": title, "matched": matched, "url": url}
+                    f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+    return path
+
+
+def read_site_output(site: str) -> dict:
+    """Load ``output/<site>_jobs.yaml`` as written by ``write_site_output`` (empty if missing)."""
+    path = os.path.join(OUTPUT_DIR, f"{site}_jobs.yaml")
+    if os.path.exists(path):
+        return load_yaml(path) or {}
+    return {}
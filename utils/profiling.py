@@ -0,0 +1,227 @@
+import contextlib
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+from typing import Dict, Optional, Tuple
+
+import bs4
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils import output
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 25
+# Leaf frames of threads parked on a lock, queue or selector; these samples
+# are dropped so idle helper threads do not fill the flamegraph
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("base_events.py", "_run_once"),
+}
+
+
+class DriverTrace:
+    """Counts WebDriver commands and their latency by wrapping ``WebDriver.execute``.
+
+    Every driver call (``get``, ``find_element``, ``execute_script``,
+    ``page_source``, element clicks...) ends up in ``execute``, keyed by its
+    W3C command name such as ``findElement`` or ``getPageSource``.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.slowest = defaultdict(float)
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __enter__(self):
+        self._original = original = WebDriver.execute
+        trace = self
+
+        def execute(driver, driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original(driver, driver_command, params)
+            finally:
+                elapsed = time.perf_counter() - start
+                with trace._lock:
+                    trace.calls[driver_command] += 1
+                    trace.seconds[driver_command] += elapsed
+                    trace.slowest[driver_command] = max(trace.slowest[driver_command], elapsed)
+
+        WebDriver.execute = execute
+        return self
+
+    def __exit__(self, *exc):
+        WebDriver.execute = self._original
+
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    def report(self) -> str:
+        lines = [f"{'command':<28}{'calls':>8}{'total s':>10}{'mean ms':>10}{'max ms':>10}"]
+        for command, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            calls = self.calls[command]
+            lines.append(
+                f"{command:<28}{calls:>8}{seconds:>10.2f}{seconds / calls * 1000:>10.1f}"
+                f"{self.slowest[command] * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+class CallTimer:
+    """Times calls to patched functions on every thread.
+
+    ``targets`` maps a label to ``(owner, attribute)``, e.g.
+    ``{"sleep": (time, "sleep")}``. Unlike cProfile this also counts calls
+    made from fan-out threads and ``asyncio.to_thread`` workers.
+    """
+
+    def __init__(self, targets: Dict[str, Tuple[object, str]]):
+        self.targets = targets
+        self.seconds = defaultdict(float)
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def __enter__(self):
+        for label, (owner, attribute) in self.targets.items():
+            original = self._originals[label] = getattr(owner, attribute)
+            setattr(owner, attribute, self._wrap(label, original))
+        return self
+
+    def __exit__(self, *exc):
+        for label, (owner, attribute) in self.targets.items():
+            setattr(owner, attribute, self._originals[label])
+
+    def _wrap(self, label, original):
+        timer = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with timer._lock:
+                    timer.seconds[label] += elapsed
+
+        return timed
+
+
+class StackSampler:
+    """Samples the stacks of all other threads into collapsed-stack counts.
+
+    The output (``frame;frame;frame count`` per line) can be fed straight to
+    flamegraph.pl or speedscope. Unlike cProfile it also covers worker threads
+    such as the fan-out search pool. Samples of idle threads (leaf frame in
+    ``IDLE_FRAMES``) are skipped.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                    continue
+                if ident not in names:
+                    thread = next((t for t in threading.enumerate() if t.ident == ident), None)
+                    names[ident] = thread.name if thread else str(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names[ident])
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+@contextlib.contextmanager
+def profile_site(site: str, out_dir: Optional[str] = None):
+    """Profile one fetcher run and write its reports to ``out_dir``.
+
+    Writes ``<site>.prof`` (cProfile, calling thread only), ``<site>.collapsed``
+    (sampled stacks of every busy thread), ``<site>_driver.txt`` (WebDriver
+    command counts and latency) and ``<site>_allocations.txt`` (top
+    tracemalloc allocation sites), then logs where the wall time went.
+    ``out_dir`` defaults to ``profile`` under ``utils.output.OUTPUT_DIR``.
+    """
+    out_dir = out_dir or os.path.join(output.OUTPUT_DIR, "profile")
+    os.makedirs(out_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(25)
+    start = time.perf_counter()
+    try:
+        timers = CallTimer({"sleep": (time, "sleep"), "parse": (bs4.BeautifulSoup, "__init__")})
+        with DriverTrace() as driver_trace, timers, StackSampler() as sampler:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+    finally:
+        # Reports are written even when the fetcher raises, and tracing is
+        # always stopped so it does not leak into the next site
+        wall = time.perf_counter() - start
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        _write_reports(site, out_dir, profiler, sampler, driver_trace, timers, snapshot, peak, wall)
+
+
+def _write_reports(site, out_dir, profiler, sampler, driver_trace, timers, snapshot, peak, wall) -> None:
+    base = os.path.join(out_dir, site)
+    profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+        f.write(sampler.collapsed())
+    with open(f"{base}_driver.txt", "w", encoding="utf-8") as f:
+        f.write(driver_trace.report())
+    with open(f"{base}_allocations.txt", "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 2**20:.1f} MiB\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
+
+    # Driver, parse and sleep times are summed over all threads, so with a
+    # fan-out pool they can add up to more than the wall time
+    logger.info(
+        f"{site}: {wall:.1f}s wall, {driver_trace.total():.1f}s in {sum(driver_trace.calls.values())} "
+        f"driver calls, {timers.seconds['parse']:.1f}s in BeautifulSoup, "
+        f"{timers.seconds['sleep']:.1f}s sleeping (all threads), "
+        f"peak {peak / 2**20:.1f} MiB - reports in {base}.*"
+    )
@@ -0,0 +1,90 @@
+"""Worker for distributed runs: claims site tasks from a shared queue, runs the
+fetcher and pushes the jobs back for the coordinator (``main.py --queue``).
+
+    python worker.py --queue redis://queue-host:6379/0 [--sites lanl osu] [--once] [--jsonl]
+"""
+import argparse
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+
+import taskqueue
+from utils import matching
+from utils import output
+from utils import profiling
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger("worker")
+
+
+def run_task(queue, owner: str, task_id: int, site: str, lease: float,
+             profile: bool = False, jsonl: bool = False) -> None:
+    done = threading.Event()
+
+    def _heartbeat():
+        while not done.wait(lease / 3):
+            if not queue.heartbeat(task_id, owner, lease):
+                logger.warning(f"{site}: lease on task {task_id} was lost")
+                return
+
+    threading.Thread(target=_heartbeat, daemon=True).start()
+    output.JSONL = jsonl
+    try:
+        module = importlib.import_module(f"sites.{site}")
+        if profile:
+            with profiling.profile_site(site):
+                jobs = module.fetch_jobs()
+        else:
+            jobs = module.fetch_jobs()
+        titles = output.read_site_output(site).get("all_titles", [])
+        if queue.complete(task_id, owner, {"jobs": jobs, "all_titles": titles}):
+            logger.info(f"{site}: task {task_id} done with {len(jobs)} jobs")
+        else:
+            logger.warning(f"{site}: task {task_id} was reassigned, result dropped")
+    except Exception as e:
+        logger.error(f"{site}: task {task_id} failed - {e}")
+        matching.forget(site)
+        queue.fail(task_id, owner, str(e))
+    finally:
+        done.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run site fetch tasks from a shared queue.")
+    parser.add_argument("--queue", required=True, help="SQLite queue path (one host) or redis:// URL")
+    parser.add_argument("--sites", nargs="*", help="only claim tasks for these sites")
+    parser.add_argument("--lease", type=float, default=taskqueue.LEASE_SECONDS, help="lease length in seconds")
+    parser.add_argument("--poll", type=float, default=5.0, help="seconds to wait when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    parser.add_argument("--profile", action="store_true", help="profile each task into output/profile")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="always write gzipped JSON Lines output (otherwise as the coordinator asks)")
+    args = parser.parse_args(argv)
+
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    queue = taskqueue.open_queue(args.queue)
+    logger.info(f"Worker {owner} polling {args.queue}")
+    while True:
+        task = queue.claim(owner, args.sites, args.lease)
+        if task is None:
+            if args.once:
+                break
+            time.sleep(args.poll)
+            continue
+        task_id, site, payload = task
+        logger.info(f"{site}: claimed task {task_id}")
+        run_task(queue, owner, task_id, site, args.lease, args.profile,
+                 args.jsonl or payload.get("jsonl", False))
+        matching.save()
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()